@@ -18,10 +18,14 @@ if str(parent_dir) not in sys.path:
 from agentom.factory import AgentFactory
 from agentom.settings import settings
 from agentom.logging_utils import CustomLoggingPlugin, logger
+from agentom.response_cache import ResponseCachePlugin
 from google.adk.plugins.base_plugin import BasePlugin
 from google.adk.apps import App, ResumabilityConfig
+import asyncio
 import atexit
 import signal
+import httpx
+import litellm
 # from agentom.utils import clear_temp_dir, clear_input_dir, clear_workspace, transfer_outputs_to_target_dir, clear_output_dir
 
 
@@ -30,6 +34,41 @@ target_dir = str(settings.OUTPUT_ARCHIVE_DIR)
 
 
 
+def _create_shared_http_client() -> httpx.AsyncClient:
+    """One keep-alive connection pool for every agent's model calls.
+
+    litellm otherwise keeps a client per endpoint for only ten minutes, after
+    which the next call builds a fresh pool and pays a new TLS handshake.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+
+
+def _close_shared_http_client(client: httpx.AsyncClient) -> None:
+    """Release the pooled connections when the interpreter exits."""
+    if client.is_closed:
+        return
+    try:
+        asyncio.run(client.aclose())
+    except Exception as e:
+        # Connections bound to an already closed event loop can't be shut
+        # down cleanly; the sockets are released with the process anyway
+        logger.debug(f"Could not close shared HTTP client: {e}")
+
+
+if litellm.aclient_session is None:
+    litellm.aclient_session = _create_shared_http_client()
+    atexit.register(_close_shared_http_client, litellm.aclient_session)
+
+
 agentom = AgentFactory.create_coordinator_agent()
 
 # Expose root agent for ADK loader compatibility
@@ -40,6 +79,6 @@ app = App(
     name=settings.APP_NAME,
     root_agent=agentom,
     resumability_config=ResumabilityConfig(is_resumable=True),
-    plugins=[CustomLoggingPlugin()],
+    plugins=[CustomLoggingPlugin(), ResponseCachePlugin()],
 )
 
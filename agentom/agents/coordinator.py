@@ -1,11 +1,20 @@
+import asyncio
+import re
+
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.models.lite_llm import LiteLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
 from agentom.settings import settings
 from .structure_agent import create_structure_agent
 from .mp_agent import create_mp_agent
 from .vision_agent import create_vision_agent
 from .wiki_agent import create_wiki_agent
-from agentom.tools.common_tools import list_all_files, write_file
+from agentom.tools.common_tools import list_all_files, read_file, write_file, run_in_thread
+from google.genai import types
 
 
 agent_description = "Root agent that manages a specialized team of agents for materials science tasks."
@@ -18,13 +27,116 @@ You are the Coordinator Agent orchestrating a specialized team for materials sci
 Your job is to understand user requests and delegate them to the most appropriate agent(s).
 Analyze what the user is asking for and route the request accordingly. 
 If multiple agents are needed, you can request information from multiple agents sequentially. 
+When sub-tasks are independent of each other (e.g. downloading data while analysing an existing structure), make one 'ask_agents_parallel' call with all of them instead, so they run at the same time. Each task must be self-contained, since the agents cannot see each other's results.
+When several visual questions concern the same structure, send them to the vision agent together in one request instead of one request per question.
 For complex tasks, please write a clear TODO list and guide the sub-agents for handling them. 
+Keep your own planning short: at most 60 words of plan per step, then make the delegation or tool call.
 Provide clear, synthesized responses to the user based on the agents' results.
 The user may provide structure files or other inputs inside the 'inputs' directory. So you can check there if needed.
 """
 
 # 4. 'wiki_agent': Provides information about materials science concepts and properties. 
 
+help_text = (
+    "I coordinate a team of materials science agents: Materials Project search and download "
+    "(mp_agent), structure building and analysis with ASE/pymatgen (structure_agent), and "
+    "visual inspection of structure images (vision_agent). Tell me what you would like to do, "
+    "e.g. \"download the stable Fe2O3 structures and build a 2x2x2 supercell\"."
+)
+
+_GREETING_RE = re.compile(r"^(hi|hello|hey|help)[.!?]*$", re.IGNORECASE)
+_LIST_FILES_RE = re.compile(r"^(ls|list( all)? files)( in (the )?workspace)?[.?]*$", re.IGNORECASE)
+_CAT_RE = re.compile(r"^cat\s+(\S+)$")
+
+
+def _format_file_tree(files: dict) -> str:
+    lines = [
+        name if subfolder == "." else f"{subfolder}/{name}"
+        for subfolder, names in sorted(files.items())
+        for name in sorted(names)
+    ]
+    return "\n".join(lines) if lines else "The workspace is empty."
+
+
+async def _answer_trivial_request(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Answer greetings, file listings and `cat <file>` without a model call.
+
+    Only applies to the first model call of a turn, i.e. when the latest
+    content is the user's own message; everything else goes to the model.
+    """
+    user_content = callback_context.user_content
+    if not llm_request.contents or not user_content or llm_request.contents[-1] != user_content:
+        return None
+    text = "".join(part.text or "" for part in user_content.parts or []).strip()
+
+    if _GREETING_RE.match(text):
+        answer = help_text
+    elif _LIST_FILES_RE.match(text):
+        answer = _format_file_tree((await asyncio.to_thread(list_all_files))["files"])
+    elif match := _CAT_RE.match(text):
+        answer = await asyncio.to_thread(read_file, match.group(1))
+    else:
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=answer)]))
+
+
+def _create_parallel_delegation_tool():
+    """
+    Build the `ask_agents_parallel` tool.
+
+    Sub-agent transfers run one after another, so independent sub-tasks cost the
+    sum of their latencies. This tool runs them concurrently on separate agent
+    instances (an agent can only have one parent, and the coordinator's own
+    sub-agents are already attached to it).
+    """
+    def create_structure_team():
+        structure_agent = create_structure_agent()
+        structure_agent.sub_agents = [create_vision_agent()]
+        return structure_agent
+
+    # The agents are only built the first time a task is sent to them, so
+    # sessions that never delegate in parallel do not pay for the extra copies.
+    agent_factories = {
+        "structure_agent": create_structure_team,
+        "mp_agent": create_mp_agent,
+    }
+    agent_tools = {}
+    # Caps concurrent runs so a large fan-out does not burst past the provider's rate limits
+    concurrency = asyncio.Semaphore(max(1, settings.AGENT_CONCURRENCY))
+
+    async def ask_agents_parallel(calls: list[dict], tool_context: ToolContext) -> list[dict]:
+        """Run independent tasks on several specialist agents at the same time.
+
+        Args:
+            calls: One entry per task, e.g. [{"agent": "mp_agent", "task": "..."},
+                {"agent": "structure_agent", "task": "..."}]. Available agents:
+                'mp_agent' and 'structure_agent'. Each task must be self-contained.
+
+        Returns:
+            One {"agent", "result"} or {"agent", "error"} entry per call, in order.
+        """
+        async def run(call: dict):
+            agent_name = call.get("agent")
+            if agent_name not in agent_factories:
+                raise ValueError(f"Unknown agent '{agent_name}'. Available agents: {list(agent_factories)}")
+            if agent_name not in agent_tools:
+                agent_tools[agent_name] = AgentTool(agent=agent_factories[agent_name]())
+            async with concurrency:
+                return await agent_tools[agent_name].run_async(
+                    args={"request": call.get("task", "")}, tool_context=tool_context
+                )
+
+        results = await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+        return [
+            {"agent": call.get("agent"), "error": str(result)}
+            if isinstance(result, Exception)
+            else {"agent": call.get("agent"), "result": result}
+            for call, result in zip(calls, results)
+        ]
+
+    return ask_agents_parallel
+
 
 def create_coordinator_agent():
     """
@@ -44,11 +156,12 @@ def create_coordinator_agent():
     structure_agent.sub_agents = [vision_agent]
 
     return Agent(
-        model=LiteLlm(settings.AGENTOM_MODEL),
+        model=LiteLlm(settings.AGENTOM_MODEL, max_retries=settings.MODEL_MAX_RETRIES),
         name="agentom",
         description=agent_description,
         instruction=agent_instruction,
-        tools=[list_all_files, write_file],
+        tools=[run_in_thread(list_all_files), run_in_thread(write_file), _create_parallel_delegation_tool()],
         sub_agents=[structure_agent, mp_agent],
+        before_model_callback=_answer_trivial_request,
         output_key="last_coordination_result",
     )
@@ -10,7 +10,7 @@ from agentom.tools.mp_tools import (
     convert_one_datus_to_structure_file,
     sample_data_from_json
 )
-from agentom.tools.common_tools import list_files
+from agentom.tools.common_tools import list_files, run_in_thread
 from agentom.settings import settings
 
 agent_description = "MP specialist for Materials Project. Searches and downloads material structures."
@@ -34,20 +34,20 @@ def create_mp_agent():
     from external databases like Materials Project.
     """
     return Agent(
-        model=LiteLlm(settings.MP_MODEL),
+        model=LiteLlm(settings.MP_MODEL, max_retries=settings.MODEL_MAX_RETRIES),
         name="mp_agent",
         description=agent_description,
         instruction=agent_instruction,
         tools=[
-            download_materials_info_by_formula,
-            download_materials_info_by_chemical_system,
-            download_materials_info_by_symmetry,
-            download_materials_info_by_mpid,
-            view_data_file,
-            convert_all_data_to_structure_files,
-            convert_one_datus_to_structure_file,
-            sample_data_from_json,
-            list_files,
+            run_in_thread(download_materials_info_by_formula),
+            run_in_thread(download_materials_info_by_chemical_system),
+            run_in_thread(download_materials_info_by_symmetry),
+            run_in_thread(download_materials_info_by_mpid),
+            run_in_thread(view_data_file),
+            run_in_thread(convert_all_data_to_structure_files),
+            run_in_thread(convert_one_datus_to_structure_file),
+            run_in_thread(sample_data_from_json),
+            run_in_thread(list_files),
         ],
         output_key="last_mp_result",  # Auto-save agent's response
     )
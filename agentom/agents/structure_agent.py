@@ -9,7 +9,7 @@ from agentom.tools.structure_tools import (
     build_interface,
     check_close_atoms,
 )
-from agentom.tools.common_tools import list_all_files, write_file, run_python_script
+from agentom.tools.common_tools import list_all_files, write_file, run_python_script, run_in_thread
 from agentom.tools.code_graph_tool import ask_code_graph_local
 from agentom.settings import settings
 
@@ -36,21 +36,21 @@ def create_structure_agent():
     It can read structures, perform calculations, generate supercells, and create surface slabs.
     """
     return Agent(
-        model=LiteLlm(settings.STRUCTURE_MODEL),
+        model=LiteLlm(settings.STRUCTURE_MODEL, max_retries=settings.MODEL_MAX_RETRIES),
         name="structure_agent",
         description=agent_description,
         instruction=agent_instruction,
         tools=[
-            list_all_files,
-            read_structure,
-            read_structures_in_text,
-            calculate_distance,
-            build_supercell,
-            build_surface,
-            build_interface,
-            write_file,
-            check_close_atoms,
-            run_python_script,
+            run_in_thread(list_all_files),
+            run_in_thread(read_structure),
+            run_in_thread(read_structures_in_text),
+            run_in_thread(calculate_distance),
+            run_in_thread(build_supercell),
+            run_in_thread(build_surface),
+            run_in_thread(build_interface),
+            run_in_thread(write_file),
+            run_in_thread(check_close_atoms),
+            run_in_thread(run_python_script),
             ask_code_graph_local,
             # FunctionTool(run_python_script, require_confirmation=True),
         ],
@@ -1,8 +1,9 @@
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
 from agentom.tools.structure_tools import generate_structure_image
 from agentom.tools.vision_tools import get_image_content
-from agentom.tools.common_tools import list_all_files
+from agentom.tools.common_tools import list_all_files, run_in_thread
 from agentom.settings import settings
 
 agent_description = "Vision specialist for analyzing atomic structures. Inspects and interprets structure images."
@@ -11,7 +12,8 @@ You are a Vision Checking Agent specialized in analyzing atomic structures from
 1. Generate images of atomic structures. 
 2. Visually inspect and analyze structure images. 
 3. Answer questions about structural properties based on visual inspection. 
-Always explain what you see in the image to justify your analysis. 
+Always explain what you see in the image to justify your analysis, but keep it brief: respond ONLY as "Observation: <at most 60 words>. Answer: <at most 30 words>." for each question, then finish your reply with a blank line followed by "End." 
+When several questions concern the same structure, load its image once and answer all of them in a single reply, one answer per question. 
 Do not perform simulations or data lookups - that's for other agents.
 """
 
@@ -24,10 +26,18 @@ def create_vision_agent():
     and analyze atomic structure images.
     """
     return Agent(
-        model=LiteLlm(settings.VISION_MODEL),
+        model=LiteLlm(settings.VISION_MODEL, max_retries=settings.MODEL_MAX_RETRIES),
         name="vision_agent",
         description=agent_description,
         instruction=agent_instruction,
-        tools=[generate_structure_image, get_image_content, list_all_files],
+        generate_content_config=types.GenerateContentConfig(
+            max_output_tokens=256,
+            stop_sequences=["\n\nEnd."],
+        ),
+        tools=[
+            run_in_thread(generate_structure_image),
+            run_in_thread(get_image_content),
+            run_in_thread(list_all_files),
+        ],
         output_key="last_vision_result",  # Auto-save agent's response
     )
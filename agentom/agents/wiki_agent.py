@@ -2,6 +2,7 @@ import shutil
 import sys
 from google.adk.agents import Agent
 from google.adk.models.lite_llm import LiteLlm
+from google.genai import types
 from google.adk.tools.mcp_tool import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 from mcp import StdioServerParameters
@@ -34,7 +35,7 @@ def create_wiki_agent():
     )
 
     return Agent(
-        model=LiteLlm(settings.WIKI_MODEL),
+        model=LiteLlm(settings.WIKI_MODEL, max_retries=settings.MODEL_MAX_RETRIES),
         name="wiki_agent",
         description="Information specialist for chemical and materials science concepts. Searches knowledge bases.",
         instruction=(
@@ -43,6 +44,7 @@ def create_wiki_agent():
             "You can search for and retrieve conceptual information to help other agents understand their work. "
             "Use the available tools to find information requested by the user."
         ),
+        generate_content_config=types.GenerateContentConfig(max_output_tokens=512),
         tools=[wiki_toolset],
         output_key="last_wiki_result",  # Auto-save agent's response
     )
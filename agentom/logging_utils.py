@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from google.adk.plugins.base_plugin import BasePlugin
@@ -46,6 +49,52 @@ def setup_logging():
 # Initialize logging
 logger = setup_logging()
 
+# Background writer for the per-session log file (see _start_file_logging)
+_file_listener = None
+
+
+def _stop_file_logging():
+    """Detach the session log file, flushing everything queued so far."""
+    global _file_listener
+    for h in logger.handlers[:]:
+        if isinstance(h, (logging.FileHandler, logging.handlers.QueueHandler)):
+            logger.removeHandler(h)
+            h.close()
+    if _file_listener is not None:
+        _file_listener.stop()
+        for h in _file_listener.handlers:
+            h.close()
+        _file_listener = None
+
+
+def _start_file_logging(log_path):
+    """Log to `log_path` without blocking the event loop on disk writes.
+
+    The agent logger only enqueues records; a QueueListener thread formats
+    them and writes the file.
+    """
+    global _file_listener
+    file_handler = logging.FileHandler(log_path, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+    log_queue = queue.SimpleQueue()
+    _file_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _file_listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+
+def current_log_file():
+    """Path of the session log file being written, or None when file logging is off."""
+    if _file_listener is None:
+        return None
+    for h in _file_listener.handlers:
+        if isinstance(h, logging.FileHandler):
+            return h.baseFilename
+    return None
+
+
+atexit.register(_stop_file_logging)
+
 class CustomLoggingPlugin(BasePlugin):
     def __init__(self):
         super().__init__(name="custom_logging")
@@ -58,19 +107,14 @@ class CustomLoggingPlugin(BasePlugin):
         # print("===================================================")
         # print(f"Session workspace set to: {settings.WORKSPACE_DIR}")
         
-        # Remove any existing file handlers to ensure per-session logging
-        for h in logger.handlers[:]:
-            if isinstance(h, logging.FileHandler):
-                logger.removeHandler(h)
-                h.close()
+        # Remove any existing file logging to ensure per-session logging
+        _stop_file_logging()
         
-        # Add file handler if logging to file
+        # Add file logging if enabled
         if settings.LOG_TO_FILE:
             log_filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{session_id}.log"
             log_path = settings.LOGS_DIR / log_filename
-            file_handler = logging.FileHandler(log_path, encoding='utf-8')
-            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
-            logger.addHandler(file_handler)
+            _start_file_logging(log_path)
             logger.info(f"Log file set: {log_path}")
         
         # Record the raw user message content
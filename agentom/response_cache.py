@@ -0,0 +1,149 @@
+"""
+Response caching for agent model calls.
+
+Identical model requests (same model, instructions, tools and conversation so
+far) are answered from a cache instead of another round trip to the LLM
+endpoint. Only the model response is reused: tool calls in a cached response
+are still executed, so file side effects happen as usual.
+
+The cache is off by default; set ``RESPONSE_CACHE_ENABLED`` to true in
+config.json to enable it. Cached responses on disk expire after
+``RESPONSE_CACHE_TTL_SECONDS`` and at most ``RESPONSE_CACHE_MAX_DISK_ENTRIES``
+are kept.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+from agentom.logging_utils import logger
+from agentom.settings import settings
+
+# In-memory entries kept per process; older ones are still served from disk.
+RESPONSE_CACHE_MAX_ENTRIES = 256
+RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+RESPONSE_CACHE_MAX_DISK_ENTRIES = 2048
+# Writes between two scans of the cache directory for eviction
+RESPONSE_CACHE_PRUNE_INTERVAL = 64
+
+
+def _request_key(llm_request) -> str:
+    """Hash a model request, ignoring the per-run ids ADK assigns to function calls."""
+    payload = llm_request.model_dump(mode="json", exclude_none=True)
+    for content in payload.get("contents", []):
+        for part in content.get("parts", []):
+            for field in ("function_call", "function_response"):
+                if field in part:
+                    part[field].pop("id", None)
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResponseCachePlugin(BasePlugin):
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        super().__init__(name="response_cache")
+        self._max_entries = max_entries
+        self._memory: OrderedDict = OrderedDict()
+        # Request keys awaiting their response, per (invocation, agent)
+        self._pending = {}
+        self._writes_since_prune = 0
+
+    @staticmethod
+    def _cache_dir():
+        return settings.WORKSPACE_ROOT / ".agent_cache"
+
+    def _get(self, key: str):
+        payload = self._memory.get(key)
+        if payload is None:
+            path = self._cache_dir() / f"{key}.json"
+            try:
+                if time.time() - path.stat().st_mtime > RESPONSE_CACHE_TTL_SECONDS:
+                    path.unlink(missing_ok=True)
+                    return None
+                payload = path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                return None
+        self._remember(key, payload)
+        return LlmResponse.model_validate_json(payload)
+
+    def _remember(self, key: str, payload: str):
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _put(self, key: str, llm_response: LlmResponse):
+        response = llm_response.model_copy(deep=True)
+        # Let ADK assign fresh function call ids when the response is replayed
+        for part in response.content.parts or []:
+            if part.function_call is not None:
+                part.function_call.id = None
+        payload = response.model_dump_json(exclude_none=True)
+        self._remember(key, payload)
+        try:
+            cache_dir = self._cache_dir()
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            (cache_dir / f"{key}.json").write_text(payload, encoding="utf-8")
+        except OSError:
+            logger.exception("Failed to persist cached response %s", key)
+            return
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= RESPONSE_CACHE_PRUNE_INTERVAL:
+            self._writes_since_prune = 0
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Drop expired cache files, then the oldest ones beyond the size cap."""
+        now = time.time()
+        entries = []
+        try:
+            for path in self._cache_dir().glob("*.json"):
+                try:
+                    mtime = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if now - mtime > RESPONSE_CACHE_TTL_SECONDS:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((mtime, path))
+            entries.sort()
+            for _, path in entries[:max(0, len(entries) - RESPONSE_CACHE_MAX_DISK_ENTRIES)]:
+                path.unlink(missing_ok=True)
+        except OSError:
+            logger.exception("Failed to prune the response cache")
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        key = _request_key(llm_request)
+        cached = self._get(key)
+        if cached is not None:
+            logger.info(f"[RESPONSE CACHE] hit for {callback_context.agent_name} ({key[:12]})")
+            return cached
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = key
+        return None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        # Streaming chunks are not cached; only the final, successful response is
+        if llm_response.partial:
+            return None
+        key = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if key is None or llm_response.error_code or llm_response.content is None:
+            return None
+        self._put(key, llm_response)
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        return None
+
+    async def after_run_callback(self, *, invocation_context):
+        # An agent's own before_model_callback can answer without calling the
+        # model, and then no after_model_callback clears the pending key
+        invocation_id = invocation_context.invocation_id
+        for pending in [k for k in self._pending if k[0] == invocation_id]:
+            del self._pending[pending]
+        return None
@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Optional
 import os
 import json
+import functools
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -40,6 +41,13 @@ def _read_env_file() -> dict:
     return env_data
 
 
+@functools.lru_cache(maxsize=1)
+def _load_config(mtime: float) -> dict:
+    """Parse config.json; keyed on its mtime so an edited file is parsed again."""
+    with open(CONFIG_FILE, 'r') as f:
+        return json.load(f)
+
+
 # Load .env values early so downstream modules (e.g., tools) can rely on them
 load_env_files()
 
@@ -63,20 +71,31 @@ class Settings(BaseModel):
     LOG_TO_FILE: bool = True
     
     # Model Configuration
-    AGENTOM_MODEL: str = "openai/qwen3-max"
+    # The coordinator only plans and routes, so a small fast model is enough;
+    # set AGENTOM_MODEL to "openai/qwen3-max" in config.json for complex sessions
+    AGENTOM_MODEL: str = "openai/qwen-turbo"
     VISION_MODEL: str = "openai/qwen3-omni-flash"
     WIKI_MODEL: str = "openai/qwen3-max"
     STRUCTURE_MODEL: str = "openai/qwen3-max"
     MP_MODEL: str = "openai/qwen-turbo"
+    # Retries (with exponential backoff) on rate limits, 5xx and timeouts per model call
+    MODEL_MAX_RETRIES: int = 4
+    # Sub-agent runs ask_agents_parallel keeps in flight at once
+    AGENT_CONCURRENCY: int = 4
+
+    # Reuse model responses for identical requests (see agentom.response_cache).
+    # Off by default: replayed tool-calling turns ignore changes to the workspace
+    RESPONSE_CACHE_ENABLED: bool = False
 
     # Output archive directory for preserving outputs
     OUTPUT_ARCHIVE_DIR: Optional[Path] = Path("outputs_archive")
 
     def __init__(self, **data):
         # Load from config file if it exists
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE, 'r') as f:
-                config_data = json.load(f)
+        config_mtime = _file_mtime(CONFIG_FILE)
+        if config_mtime is not None:
+            # Copy, the cached dict is shared by every Settings instance
+            config_data = dict(_load_config(config_mtime))
             # Convert WORKSPACE_ROOT to Path if present
             if 'WORKSPACE_ROOT' in config_data:
                 wd = Path(config_data['WORKSPACE_ROOT'])
@@ -185,6 +204,12 @@ class DynamicSettings:
     def reload_now(self):
         self._reload_if_stale(force=True)
 
+    @property
+    def env_mtime(self):
+        """Modification time of the .env file as of the last reload (None if absent)."""
+        self._reload_if_stale()
+        return self._env_mtime
+
     def __getattr__(self, item):
         self._reload_if_stale()
         return getattr(self._settings, item)
@@ -1,4 +1,5 @@
 from pathlib import Path
+import asyncio
 import socket
 import time
 import subprocess
@@ -130,7 +131,8 @@ def _ensure_graph_indexed_with_ingestor(
 
 async def ask_code_graph_local(question: str) -> str:
     """Query code-graph-rag locally without MCP."""
-    _ensure_memgraph_running()
+    # Starting Memgraph and indexing block for a long time; keep them off the loop
+    await asyncio.to_thread(_ensure_memgraph_running)
     repo_path = _resolve_repo_path()
     logger.info(f"[code_graph_tool] question: {question[:200]}")
     logger.info(f"[code_graph_tool] repo_path: {repo_path}")
@@ -140,8 +142,10 @@ async def ask_code_graph_local(question: str) -> str:
             with MemgraphIngestor(
                 host=rag_settings.MEMGRAPH_HOST, port=rag_settings.MEMGRAPH_PORT
             ) as ingestor:
-                _ensure_graph_indexed_with_ingestor(ingestor, repo_path)
-                rag_agent = initialize_rag_agent(repo_path, ingestor)
+                await asyncio.to_thread(
+                    _ensure_graph_indexed_with_ingestor, ingestor, repo_path
+                )
+                rag_agent = initialize_rag_agent(repo_path, ingestor, mode="read")
                 result = await rag_agent.run(question, message_history=[])
                 return str(result.output)
         except mgclient.OperationalError as e:
@@ -149,5 +153,5 @@ async def ask_code_graph_local(question: str) -> str:
             logger.warning(
                 f"[code_graph_tool] Memgraph handshake failed, retrying... {e}"
             )
-            time.sleep(2)
+            await asyncio.sleep(2)
     raise last_error or RuntimeError("Memgraph connection failed.")
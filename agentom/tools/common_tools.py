@@ -1,5 +1,7 @@
 import os
 import ast
+import asyncio
+import functools
 from pathlib import Path
 # from RestrictedPython import compile_restricted, safe_globals, limited_builtins, utility_builtins
 import subprocess
@@ -8,10 +10,26 @@ import sys
 from agentom.settings import settings
 
 
+def run_in_thread(func):
+    """Wrap a blocking tool so the agent runs it in a worker thread.
+
+    ADK calls synchronous tools directly on the event loop, which stalls every
+    other agent (e.g. in ask_agents_parallel) while one tool waits on the
+    network, a subprocess or a long calculation. The wrapper keeps the name,
+    docstring and signature the tool declaration is built from.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
 def safe_path(rel_path: str) -> Path:
     """Resolve relative path to absolute within workspace and prevent escapes."""
-    full_path = (settings.WORKSPACE_DIR / rel_path).resolve()
-    if not full_path.is_relative_to(settings.WORKSPACE_DIR):
+    workspace_dir = settings.WORKSPACE_DIR
+    # Always resolve: a symlink inside the workspace may point outside it
+    full_path = (workspace_dir / rel_path).resolve()
+    if not full_path.is_relative_to(workspace_dir):
         raise ValueError("Access denied: Path outside workspace")
     return full_path
 
@@ -78,7 +96,9 @@ def list_files(directory: str) -> str:
                 return {"files": ''}
         if not path.is_dir():
             return {"error": f"{directory} is not a directory"}
-        files = [f.name for f in path.iterdir() if f.is_file()]
+        # scandir reports the entry type without a stat call per file
+        with os.scandir(path) as entries:
+            files = [entry.name for entry in entries if entry.is_file()]
         return {"files": '\n'.join(files)}
     except Exception as e:
         return {"error": str(e)}
@@ -86,21 +106,24 @@ def list_files(directory: str) -> str:
 
 def list_all_files():
     """Lists all files available in the workspace directory, in a tree-like structure, with their relative subfolder paths as keys."""
-    if not settings.WORKSPACE_DIR.exists():
+    # Read the settings paths once; every settings access stats the config files
+    workspace_dir = settings.WORKSPACE_DIR
+    logs_dir = settings.LOGS_DIR
+    if not workspace_dir.exists():
         return {"files": []}
     files = {}
-    for path in settings.WORKSPACE_DIR.rglob("*"):
+    for path in workspace_dir.rglob("*"):
         if path.is_file():
             # Skip anything under the logs directory so logs are not listed
             try:
-                if path.is_relative_to(settings.LOGS_DIR):
+                if path.is_relative_to(logs_dir):
                     continue
             except Exception:
-                if str(settings.LOGS_DIR) in str(path):
+                if str(logs_dir) in str(path):
                     continue
 
             try:
-                subfolder = path.parent.relative_to(settings.WORKSPACE_DIR)
+                subfolder = path.parent.relative_to(workspace_dir)
                 files.setdefault(str(subfolder), []).append(path.name)
             except ValueError:
                 # Handle case where path is not relative to WORKSPACE_DIR (should not happen with rglob)
@@ -153,6 +176,12 @@ class CodeValidator(ast.NodeVisitor):
                         raise ValueError(f"Prohibited import from os: {alias.name}")
         self.generic_visit(node)
 
+@functools.lru_cache(maxsize=128)
+def _validate_code(code_content: str):
+    """Parse and check a script; scripts that passed before are not re-walked."""
+    CodeValidator().visit(ast.parse(code_content))
+
+
 def run_python_script(script_name: str) -> dict:
     """Runs a Python script in the workspace directly."""
     
@@ -176,9 +205,7 @@ def run_python_script(script_name: str) -> dict:
     try:
         with open(resolved_path, 'r') as f:
             code_content = f.read()
-        tree = ast.parse(code_content)
-        validator = CodeValidator()
-        validator.visit(tree)
+        _validate_code(code_content)
     except Exception as e:
         return {"error": f"Security check failed: {str(e)}"}
     
@@ -1,72 +1,546 @@
 from typing import Optional
 from mp_api.client import MPRester
+import io
 import os
 import json
+import time
+import atexit
+import shutil
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is an optional speed-up
+    ijson = None
+
+try:
+    import requests_cache
+except ImportError:  # pragma: no cover - requests-cache is an optional speed-up
+    requests_cache = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional speed-up
+    zstandard = None
+
 from ase import Atoms
 from ase.io import write
+from pymatgen.core.lattice import Lattice
 from pymatgen.core.structure import Structure
 from pymatgen.io.ase import AseAtomsAdaptor
 
 from agentom.settings import settings
 
 
-IMPORTANT_FIELDS = [
+SCALAR_FIELDS = [
     "material_id", 
     "formula_pretty", 
     "energy_above_hull", 
     "is_stable", 
     "symmetry", 
-    "structure", 
     "nelements", 
     "nsites"
 ]
+# The structure is by far the largest field, so searches can leave it out and
+# fetch it per mpid only when a structure file is actually needed.
+STRUCTURE_FIELDS = ["structure"]
+IMPORTANT_FIELDS = SCALAR_FIELDS + STRUCTURE_FIELDS
+
+# Scalar fields of a saved MP entry that can be viewed or filtered on.
+VIEWABLE_FIELDS = [
+    'mpid', 'formula', 'e_hull', 'is_stable',
+    'crystal_system', 'spacegroup_symbol', 'num_elements', 'num_sites',
+]
+_VIEWABLE_FIELD_SET = frozenset(VIEWABLE_FIELDS)
+
+# Identical searches within this window reuse the saved result file.
+MP_CACHE_MAX_AGE = 7 * 24 * 3600
+MP_CACHE_MAX_ENTRIES = 500
+
+# Buffer size for JSON dumps; large enough that most files are one syscall.
+JSON_IO_BUFFER_SIZE = 1 << 20
+
+# Per-entry structure files are zstd-compressed when zstandard is installed.
+# Index files stay plain JSON so they can be streamed and seeked into.
+STRUCTURE_FILE_SUFFIX = ".json.zst" if zstandard is not None else ".json"
+ZSTD_LEVEL = 3
+
+# Formats pymatgen can render to a string via Structure.to(fmt=...).
+PMG_STRING_FORMATS = frozenset({"cif", "poscar", "cssr", "json", "xsf", "mcsqs", "yaml"})
+
+# Batches smaller than this are converted serially.
+PARALLEL_CONVERT_MIN_ENTRIES = 32
+# Upper bound on worker processes for the conversion pool
+PARALLEL_CONVERT_MAX_WORKERS = 4
+
+_convert_pool: ProcessPoolExecutor | None = None
+_convert_pool_lock = threading.Lock()
+
+_mpr_singleton: MPRester | None = None
+_mpr_api_key: str | None = None
+_mpr_lock = threading.Lock()
 
 # MP_API_KEY is expected in environment variables. Optional .env files are loaded
 # centrally in agentom.settings (config/.env preferred; root .env supported).
 
 
+# (env_mtime, api_key) of the last successful lookup
+_mp_api_key_cache: tuple | None = None
+
+
 def _get_mp_api_key() -> str | None:
-    """Return the Materials Project API key from environment or .env, or None."""
-    return os.getenv("MP_API_KEY")
+    """Return the Materials Project API key from environment or .env, or None.
 
+    A found key is memoized until settings hot-reloads the .env file; a missing
+    key is looked up again on every call, so exporting MP_API_KEY later works.
+    Call ``_clear_mp_api_key_cache()`` after changing ``os.environ`` directly.
+    """
+    global _mp_api_key_cache
+    env_mtime = settings.env_mtime
+    cached = _mp_api_key_cache
+    if cached is not None and cached[0] == env_mtime:
+        return cached[1]
+    api_key = os.getenv("MP_API_KEY")
+    if api_key:
+        _mp_api_key_cache = (env_mtime, api_key)
+    return api_key
 
-# Under construction
-def _save_docs_to_json(docs: list, filename: str) -> Path:
-    results = [{
-        "mpid": doc.material_id, 
-        "formula": doc.formula_pretty, 
+
+def _clear_mp_api_key_cache() -> None:
+    """Forget the memoized key so the next lookup reads the environment again."""
+    global _mp_api_key_cache
+    _mp_api_key_cache = None
+
+
+def _get_mpr() -> MPRester:
+    """Return a process-wide MPRester, reusing its HTTP session across searches.
+
+    The client is rebuilt if the API key changes (e.g. after a .env hot-reload).
+    """
+    global _mpr_singleton, _mpr_api_key
+    api_key = _get_mp_api_key()
+    if not api_key:
+        raise RuntimeError("MP_API_KEY not set. Please set the environment variable `MP_API_KEY` "
+        "or add it to a .env file in the project root.")
+    with _mpr_lock:
+        if _mpr_singleton is None or api_key != _mpr_api_key:
+            _close_mpr()
+            _mpr_singleton = MPRester(api_key=api_key, session=_make_http_session(api_key))
+            _mpr_api_key = api_key
+        return _mpr_singleton
+
+
+def _make_http_session(api_key: str):
+    """Return an HTTP-caching session for MPRester, or None to use its default.
+
+    Only GET responses are cached, so identical paginated search requests are
+    answered from disk instead of re-hitting the server.
+    """
+    if requests_cache is None:
+        return None
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    cache_dir = settings.TEMP_DIR / "mp_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    session = requests_cache.CachedSession(
+        str(cache_dir / "http_cache"),
+        backend="sqlite",
+        expire_after=MP_CACHE_MAX_AGE,
+        allowable_methods=("GET",),
+    )
+    session.headers["x-api-key"] = api_key
+    # Keep MPRester's retry-on-rate-limit behaviour for the custom session.
+    retry = Retry(total=3, backoff_factor=0.1, respect_retry_after_header=True,
+                  status_forcelist=[429, 502, 504])
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
+
+
+def _close_mpr() -> None:
+    global _mpr_singleton
+    if _mpr_singleton is not None:
+        _mpr_singleton.__exit__(None, None, None)
+        _mpr_singleton = None
+
+
+atexit.register(_close_mpr)
+
+
+def _get_convert_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by all conversions, starting it on first use.
+
+    Workers are started with forkserver: the tools run in worker threads of a
+    process that already has HTTP client and logging threads, and forking such
+    a process can deadlock on locks held by those threads.
+    """
+    global _convert_pool
+    with _convert_pool_lock:
+        if _convert_pool is None:
+            _convert_pool = ProcessPoolExecutor(
+                max_workers=min(PARALLEL_CONVERT_MAX_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _convert_pool
+
+
+def _close_convert_pool() -> None:
+    global _convert_pool
+    if _convert_pool is not None:
+        _convert_pool.shutdown(wait=True, cancel_futures=True)
+        _convert_pool = None
+
+
+atexit.register(_close_convert_pool)
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+
+def _loads(payload: bytes):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _write_json(path: Path, obj) -> None:
+    """Serialize ``obj`` in memory, then write it to ``path`` in a single buffered call.
+
+    orjson is used when it is installed, otherwise the stdlib json module. Paths
+    ending in ``.zst`` are zstd-compressed.
+    """
+    payload = _dumps(obj)
+    if path.suffix == ".zst":
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    with open(path, "wb", buffering=JSON_IO_BUFFER_SIZE) as f:
+        f.write(payload)
+
+
+def _read_json(path: Path):
+    """Load JSON from ``path``, using orjson when it is installed.
+
+    Paths ending in ``.zst`` are decompressed first.
+    """
+    with open(path, "rb", buffering=JSON_IO_BUFFER_SIZE) as f:
+        payload = f.read()
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path.name} requires the zstandard package.")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    return _loads(payload)
+
+
+def _offsets_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.idx")
+
+
+def _write_json_entries(path: Path, entries: list) -> None:
+    """Write ``entries`` as a JSON array plus a ``<name>.idx`` side-car of byte offsets.
+
+    The side-car is a flat ``uint64`` array holding the start offset of every entry
+    followed by one past-the-end sentinel, so a single entry can be read back with
+    one seek instead of parsing the whole array.
+    """
+    chunks = [_dumps(entry) for entry in entries]
+    offsets = np.empty(len(chunks) + 1, dtype=np.uint64)
+    position = 1  # skip the opening "["
+    for i, chunk in enumerate(chunks):
+        offsets[i] = position
+        position += len(chunk) + 1  # entry plus its "," (or the closing "]")
+    offsets[len(chunks)] = max(position, 2)
+    with open(path, "wb", buffering=JSON_IO_BUFFER_SIZE) as f:
+        f.write(b"[" + b",".join(chunks) + b"]")
+    offsets.tofile(_offsets_path(path))
+
+
+def _read_entry_offsets(path: Path) -> np.ndarray | None:
+    """Return the memory-mapped offsets of ``path``, or None if missing or stale."""
+    offsets_path = _offsets_path(path)
+    try:
+        data_stat = path.stat()
+        offsets_stat = offsets_path.stat()
+    except FileNotFoundError:
+        return None
+    if offsets_stat.st_mtime_ns < data_stat.st_mtime_ns or offsets_stat.st_size == 0:
+        return None
+    offsets = np.memmap(offsets_path, dtype=np.uint64, mode="r")
+    if int(offsets[-1]) != data_stat.st_size:
+        return None
+    return offsets
+
+
+def _read_entries_at(path: Path, offsets: np.ndarray, indices) -> list:
+    """Read the entries at ``indices`` of an array written by _write_json_entries."""
+    entries = []
+    with open(path, "rb") as f:
+        for index in indices:
+            start, end = int(offsets[index]), int(offsets[index + 1]) - 1
+            f.seek(start)
+            entries.append(_loads(f.read(end - start)))
+    return entries
+
+
+def _iter_json_items(path: Path):
+    """Yield the entries of a top-level JSON array one at a time.
+
+    With ijson installed the file is parsed incrementally, so callers that stop
+    early never materialize the rest of the file.
+    """
+    if ijson is None:
+        yield from _read_json(path)
+        return
+    with open(path, "rb", buffering=JSON_IO_BUFFER_SIZE) as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def _rel(path: Path, workspace_dir: Path) -> str:
+    """Workspace-relative form of ``path`` via a string prefix strip.
+
+    Cheaper than Path.relative_to in per-entry loops; ``path`` must lie inside
+    ``workspace_dir``.
+    """
+    return os.fspath(path).removeprefix(os.fspath(workspace_dir) + os.sep)
+
+
+def _doc_to_entry(doc) -> dict:
+    """Flatten the scalar fields of one MP summary doc, touching each attribute once."""
+    symmetry = doc.symmetry
+    return {
+        "mpid": doc.material_id,
+        "formula": doc.formula_pretty,
         "e_hull": doc.energy_above_hull,
         "is_stable": doc.is_stable,
-        "crystal_system": doc.symmetry.crystal_system,
-        "spacegroup_symbol": doc.symmetry.symbol,
+        "crystal_system": symmetry.crystal_system,
+        "spacegroup_symbol": symmetry.symbol,
         "num_elements": doc.nelements,
         "num_sites": doc.nsites,
-        "structure": doc.structure.as_dict()
-    } for doc in docs]
+    }
+
 
+def _save_docs_to_json(docs: list, filename: str) -> Path:
+    """Save MP docs as a scalar index file plus one structure file per entry.
+
+    The index (``filename``) holds only the scalar fields and a workspace-relative
+    ``structure_ref``; the structures live under ``<stem>_structures/<mpid>.json``
+    (``.json.zst`` when zstandard is installed).
+    Scalar-only readers therefore never parse structure payloads. Rewriting an
+    index replaces its structures directory, so no files of the old result remain.
+    """
+    workspace_dir = settings.WORKSPACE_DIR
     file_path = settings.TEMP_DIR / filename
+    structures_dir = file_path.with_name(f"{file_path.stem}_structures")
+    shutil.rmtree(structures_dir, ignore_errors=True)
+    structures_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for doc in docs:
+        entry = _doc_to_entry(doc)
+        structure = getattr(doc, "structure", None)
+        if structure is not None:
+            structure_path = structures_dir / f"{entry['mpid']}{STRUCTURE_FILE_SUFFIX}"
+            _write_json(structure_path, structure.as_dict())
+            entry["structure_ref"] = _rel(structure_path, workspace_dir)
+        results.append(entry)
+
     docs_info = {
         "num_results": len(results),
-        "relative_path": file_path.relative_to(settings.WORKSPACE_DIR),
+        "relative_path": file_path.relative_to(workspace_dir),
     }
-    with open(file_path, "w") as f:
-        json.dump(results, f, default=str)
+    _write_json_entries(file_path, results)
     return docs_info
 
-def _save_dict_to_file(structure_dict: dict, file_name: str = None, target_format: str = "extxyz"):
-    # Convert dict to pymatgen Structure
-    pmg_structure = Structure.from_dict(structure_dict)
-    # save to the target format using pymatgen's built-in writers
+
+def _load_entry_structure(entry: dict, workspace_dir: Path | None = None) -> dict | None:
+    """Return the structure dict of an index entry, or None if it has none.
+
+    Entries written before the index/structures split carry the structure inline.
+    Pass ``workspace_dir`` when calling in a loop to avoid re-reading settings.
+    """
+    structure_dict = entry.get("structure")
+    if structure_dict is not None:
+        return structure_dict
+    structure_ref = entry.get("structure_ref")
+    if structure_ref is None:
+        return None
+    if workspace_dir is None:
+        workspace_dir = settings.WORKSPACE_DIR
+    return _read_json(workspace_dir / structure_ref)
+
+
+def _fetch_structures_by_mpid(mpids: list[str]) -> dict[str, dict]:
+    """Return structure dicts for ``mpids``, downloading only those not fetched before.
+
+    Used for results saved without structures (``fetch_structure=False``). Fetched
+    structures are kept under ``TEMP_DIR/mp_structures`` for later conversions.
+    """
+    structures_dir = settings.TEMP_DIR / "mp_structures"
+    structures = {}
+    missing = []
+    for mpid in mpids:
+        structure_path = structures_dir / f"{mpid}{STRUCTURE_FILE_SUFFIX}"
+        if not structure_path.exists():
+            # Fall back to a copy written before compression was available.
+            structure_path = structures_dir / f"{mpid}.json"
+        if structure_path.exists():
+            structures[mpid] = _read_json(structure_path)
+        else:
+            missing.append(mpid)
+    if missing:
+        docs = _get_mpr().materials.summary.search(
+            material_id=missing,
+            fields=["material_id"] + STRUCTURE_FIELDS,
+        )
+        structures_dir.mkdir(parents=True, exist_ok=True)
+        for doc in docs:
+            mpid = str(doc.material_id)
+            structures[mpid] = doc.structure.as_dict()
+            _write_json(structures_dir / f"{mpid}{STRUCTURE_FILE_SUFFIX}", structures[mpid])
+    return structures
+
+
+def _search_cache_key(search_kwargs: dict) -> str:
+    payload = json.dumps(sorted(search_kwargs.items()), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get_cached_docs_info(cache_file: Path, key: str) -> dict | None:
+    """Return cached docs_info for ``key`` if it is fresh and its result file is untouched."""
+    if not cache_file.exists():
+        return None
+    try:
+        cached = _read_json(cache_file).get(key)
+    except Exception:
+        return None
+    if cached is None or time.time() - cached["created"] > MP_CACHE_MAX_AGE:
+        return None
+    result_path = settings.WORKSPACE_DIR / cached["relative_path"]
+    try:
+        # Another query may have rewritten the same result file since then.
+        if result_path.stat().st_mtime_ns != cached["mtime_ns"]:
+            return None
+    except FileNotFoundError:
+        return None
+    return {"num_results": cached["num_results"], "relative_path": Path(cached["relative_path"])}
+
+
+def _put_cached_docs_info(cache_file: Path, key: str, docs_info: dict) -> None:
+    cache = {}
+    if cache_file.exists():
+        try:
+            cache = _read_json(cache_file)
+        except Exception:
+            cache = {}
+    relative_path = docs_info["relative_path"]
+    cache[key] = {
+        "num_results": docs_info["num_results"],
+        "relative_path": relative_path.as_posix(),
+        "mtime_ns": (settings.WORKSPACE_DIR / relative_path).stat().st_mtime_ns,
+        "created": time.time(),
+    }
+    if len(cache) > MP_CACHE_MAX_ENTRIES:
+        newest = sorted(cache.items(), key=lambda item: item[1]["created"])[-MP_CACHE_MAX_ENTRIES:]
+        cache = dict(newest)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    _write_json(cache_file, cache)
+
+
+def _search_and_save(filename: str, fetch_structure: bool = True, **search_kwargs) -> dict:
+    """Run an MP summary search and save the docs, reusing a cached result when possible.
+
+    Results are keyed by the full set of search arguments, so repeating an identical
+    search within ``MP_CACHE_MAX_AGE`` returns the already-written file without
+    contacting the Materials Project API.
+    """
+    cache_file = settings.TEMP_DIR / "mp_cache" / "index.json"
+    key = _search_cache_key({**search_kwargs, "fetch_structure": fetch_structure})
+    docs_info = _get_cached_docs_info(cache_file, key)
+    if docs_info is not None:
+        return docs_info
+
+    fields = SCALAR_FIELDS + (STRUCTURE_FIELDS if fetch_structure else [])
+    mpr = _get_mpr()
+    docs = mpr.materials.summary.search(fields=fields, **search_kwargs)
+
+    docs_info = _save_docs_to_json(docs, filename)
+    _put_cached_docs_info(cache_file, key, docs_info)
+    return docs_info
+
+
+def _structure_file_name(structure_dict: dict, file_name: str | None, target_format: str) -> str:
     if file_name is None:
         prefix = structure_dict.get("label", "structure")
-        file_name = f"{prefix}.{target_format}"
-    else:
-        file_name = f"{file_name}.{target_format}"
-    full_path = settings.OUTPUT_DIR / file_name
+        return f"{prefix}.{target_format}"
+    return f"{file_name}.{target_format}"
+
+
+def _structure_from_dict(structure_dict: dict) -> Structure:
+    """Build a Structure from an ``as_dict()`` payload of trusted MP data.
+
+    Ordered structures (one unoxidized element per fully occupied site, the usual
+    MP case) go straight to the Structure constructor instead of building every
+    PeriodicSite via from_dict; anything else falls back to Structure.from_dict.
+    """
+    sites = structure_dict["sites"]
+    species = []
+    for site in sites:
+        site_species = site["species"]
+        if (len(site_species) != 1 or site_species[0].get("occu", 1) != 1
+                or site_species[0].get("oxidation_state")):
+            return Structure.from_dict(structure_dict)
+        species.append(site_species[0]["element"])
+    site_properties = [site.get("properties") or {} for site in sites]
+    keys = site_properties[0].keys() if site_properties else set()
+    if any(props.keys() != keys for props in site_properties):
+        return Structure.from_dict(structure_dict)
+    lattice = structure_dict["lattice"]
+    return Structure(
+        Lattice(lattice["matrix"], pbc=tuple(lattice.get("pbc", (True, True, True)))),
+        species,
+        [site["abc"] for site in sites],
+        charge=structure_dict.get("charge"),
+        site_properties={key: [props[key] for props in site_properties] for key in keys} or None,
+        labels=[site.get("label") for site in sites],
+        properties=structure_dict.get("properties"),
+    )
+
+
+def _write_structure_file(structure_dict: dict, full_path: Path, target_format: str) -> None:
+    # Convert dict to pymatgen Structure
+    pmg_structure = _structure_from_dict(structure_dict)
+    # save to the target format using pymatgen's built-in writers, rendered in
+    # memory and written in one call; other formats go through ASE.
+    if target_format.lower() in PMG_STRING_FORMATS:
+        full_path.write_text(pmg_structure.to(fmt=target_format.lower()))
+        return
     ase_structure = pmg_structure.to_ase_atoms()
     write(full_path, ase_structure)
+
+
+def _save_dict_to_file_worker(task: tuple[dict, str, str]) -> None:
+    """Process-pool entry point; takes explicit paths since workers do not share session settings."""
+    structure_dict, full_path, target_format = task
+    _write_structure_file(structure_dict, Path(full_path), target_format)
+
+
+def _save_dict_to_file(structure_dict: dict, file_name: str = None, target_format: str = "extxyz"):
+    full_path = settings.OUTPUT_DIR / _structure_file_name(structure_dict, file_name, target_format)
+    _write_structure_file(structure_dict, full_path, target_format)
     relative_path = full_path.relative_to(settings.WORKSPACE_DIR)
     return relative_path
 
@@ -77,7 +551,8 @@ def download_materials_info_by_formula(
     min_energy_above_hull: Optional[float] = None,
     max_energy_above_hull: Optional[float] = None,
     is_stable: Optional[bool] = None,
-    spacegroup_number: Optional[int | list[int]] = None
+    spacegroup_number: Optional[int | list[int]] = None,
+    fetch_structure: bool = True
 ) -> str:
     """
     Download materials information by chemical formula from Materials Project.
@@ -89,26 +564,13 @@ def download_materials_info_by_formula(
         max_energy_above_hull: Maximum energy above hull in eV (optional)
         is_stable: Filter for stable materials on convex hull (optional)
         spacegroup_number: Spacegroup number(s) (optional)
+        fetch_structure: Whether to download structures now; if False they are fetched when converting (optional)
         num_results: Maximum number of results to return
     """
-    api_key = _get_mp_api_key()
-    if not api_key:
-        raise RuntimeError("MP_API_KEY not set. Please set the environment variable `MP_API_KEY` "
-        "or add it to a .env file in the project root.")
-    
     energy_above_hull = None
     if min_energy_above_hull is not None and max_energy_above_hull is not None:
         energy_above_hull = (min_energy_above_hull, max_energy_above_hull)
     
-    with MPRester(api_key=api_key) as mpr:
-        docs = mpr.materials.summary.search(
-            formula=formula,
-            energy_above_hull=energy_above_hull,
-            is_stable=is_stable,
-            spacegroup_number=spacegroup_number,
-            fields=IMPORTANT_FIELDS,
-        )
-    
     # # Serialize results to JSON string for agent
     # results = [{"mpid": doc.material_id, "formula": doc.formula_pretty, "e_hull": doc.energy_above_hull, "structure": doc.structure.as_dict()} for doc in docs]
     # # store the results in the tmp folder inside the workspace of agent for later retrieval
@@ -116,7 +578,14 @@ def download_materials_info_by_formula(
     # with open(file_path, "w") as f:
     #     json.dump(results, f, default=str)
 
-    docs_info = _save_docs_to_json(docs, f'mp_search_{formula.replace("*", "X")}.json')
+    docs_info = _search_and_save(
+        f'mp_search_{formula.replace("*", "X")}.json',
+        formula=formula,
+        energy_above_hull=energy_above_hull,
+        is_stable=is_stable,
+        spacegroup_number=spacegroup_number,
+        fetch_structure=fetch_structure,
+    )
     # Return only string information for agent, rather than the raw results since they may contain complex objects
     relative_path = docs_info["relative_path"]
     to_agent_info = f"Found {docs_info['num_results']} materials matching formula {formula}. "
@@ -128,7 +597,8 @@ def download_materials_info_by_chemical_system(
     chemical_system: str,
     min_energy_above_hull: Optional[float] = None,
     max_energy_above_hull: Optional[float] = None,
-    spacegroup_symbol: Optional[str | list[str]] = None
+    spacegroup_symbol: Optional[str | list[str]] = None,
+    fetch_structure: bool = True
 ) -> str:
     """
     Download materials information by chemical system from Materials Project.
@@ -139,29 +609,23 @@ def download_materials_info_by_chemical_system(
         min_energy_above_hull: Minimum energy above hull in eV (optional)
         max_energy_above_hull: Maximum energy above hull in eV (optional)
         spacegroup_symbol: Spacegroup symbol(s) (optional)
+        fetch_structure: Whether to download structures now; if False they are fetched when converting (optional)
         num_results: Maximum number of results to return
 
     Returns:
         A string summary of the search results.
     """
-    api_key = _get_mp_api_key()
-    if not api_key:
-        raise RuntimeError("MP_API_KEY not set. Please set the environment variable `MP_API_KEY` "
-        "or add it to a .env file in the project root.")
-    
     energy_above_hull = None
     if min_energy_above_hull is not None and max_energy_above_hull is not None:
         energy_above_hull = (min_energy_above_hull, max_energy_above_hull)
     
-    with MPRester(api_key=api_key) as mpr:
-        docs = mpr.materials.summary.search(
-            chemsys=chemical_system,
-            energy_above_hull=energy_above_hull,
-            spacegroup_symbol=spacegroup_symbol,
-            fields=IMPORTANT_FIELDS,
-        )
-
-    docs_info = _save_docs_to_json(docs, f'mp_search_{chemical_system.replace("-", "_")}.json')
+    docs_info = _search_and_save(
+        f'mp_search_{chemical_system.replace("-", "_")}.json',
+        chemsys=chemical_system,
+        energy_above_hull=energy_above_hull,
+        spacegroup_symbol=spacegroup_symbol,
+        fetch_structure=fetch_structure,
+    )
     relative_path = docs_info["relative_path"]
     to_agent_info = f"Found {docs_info['num_results']} materials in chemical system {chemical_system}. "
     to_agent_info += f"The results are stored in {relative_path} for further analysis."    
@@ -171,7 +635,8 @@ def download_materials_info_by_chemical_system(
 def download_materials_info_by_symmetry(
     crystal_system: str,
     spacegroup_number: Optional[int | list[int]] = None,
-    elements: Optional[list[str]] = None
+    elements: Optional[list[str]] = None,
+    fetch_structure: bool = True
 ) -> str:
     """
     Download materials information by structural properties like spacegroup.
@@ -180,25 +645,19 @@ def download_materials_info_by_symmetry(
         crystal_system: Crystal system (e.g., 'cubic', 'hexagonal')
         spacegroup_number: Spacegroup number(s)
         elements: Optional elements to include
+        fetch_structure: Whether to download structures now; if False they are fetched when converting
         num_results: Maximum number of results to return
 
     Returns:
         A string summary of the search results.
     """
-    api_key = _get_mp_api_key()
-    if not api_key:
-        raise RuntimeError("MP_API_KEY not set. Please set the environment variable `MP_API_KEY` "
-        "or add it to a .env file in the project root.")
-    
-    with MPRester(api_key=api_key) as mpr:
-        docs = mpr.materials.summary.search(
-            spacegroup_number=spacegroup_number,
-            crystal_system=crystal_system,
-            elements=elements,
-            fields=IMPORTANT_FIELDS,
-        )
-    
-    docs_info = _save_docs_to_json(docs, f'mp_search_structure_{crystal_system}.json')
+    docs_info = _search_and_save(
+        f'mp_search_structure_{crystal_system}.json',
+        spacegroup_number=spacegroup_number,
+        crystal_system=crystal_system,
+        elements=elements,
+        fetch_structure=fetch_structure,
+    )
     relative_path = docs_info["relative_path"]
     to_agent_info = f"Found {docs_info['num_results']} materials with crystal system {crystal_system}. "
     to_agent_info += f"The results are stored in {relative_path} for further analysis."
@@ -216,22 +675,33 @@ def download_materials_info_by_mpid(
     Returns:
         A string summary of the search results.
     """
-    api_key = _get_mp_api_key()
-    if not api_key:
-        raise RuntimeError("MP_API_KEY not set. Please set the environment variable `MP_API_KEY` "
-        "or add it to a .env file in the project root.")
-    with MPRester(api_key=api_key) as mpr:
-        docs = mpr.materials.summary.search(
-            material_id=mpids,
-            fields=IMPORTANT_FIELDS,
-        )
-    docs_info = _save_docs_to_json(docs, f'mp_download_mpids.json')
+    docs_info = _search_and_save(f'mp_download_mpids.json', material_id=mpids)
     relative_path = docs_info["relative_path"]
     to_agent_info = f"Downloaded {docs_info['num_results']} materials for given mpids. "
     to_agent_info += f"The results are stored in {relative_path} for further analysis."
     return {"result": to_agent_info}
 
 
+def _make_projection(fields: list[str]):
+    """Return a function mapping an entry to the tuple of its ``fields`` values.
+
+    Missing fields are reported as "N/A".
+    """
+    if not fields:
+        return lambda entry: ()
+    getter = itemgetter(*fields)
+    single = len(fields) == 1
+
+    def project(entry: dict) -> tuple:
+        try:
+            values = getter(entry)
+        except KeyError:
+            return tuple(entry.get(field, "N/A") for field in fields)
+        return (values,) if single else values
+
+    return project
+
+
 def view_data_file(file_path: str, view_types: list[str], lines: int) -> str:
     """Briefly view the contents of a data file (JSON) stored in the workspace.
     
@@ -245,24 +715,22 @@ def view_data_file(file_path: str, view_types: list[str], lines: int) -> str:
         return f"Error: File not found at {full_path}"
     
     try:
-        with open(full_path, "r") as f:
-            data = json.load(f)
-        viewable_fields = ['mpid', 'formula', 'e_hull', 'is_stable', 'crystal_system', 'spacegroup_symbol', 'num_elements', 'num_sites']
-        for vt in view_types:
-            if vt not in viewable_fields:
-                return f"Error: Unsupported view type '{vt}'. Supported types are: {viewable_fields}"
-        # get the viewable info in a csv-like string
-        output_lines = []
-        header = "Index, " + ", ".join(view_types)
-        output_lines.append(header)
-        for i, entry in enumerate(data):
-            line = [str(i)]
-            for vt in view_types:
-                line.append(str(entry.get(vt, "N/A")))
-            output_lines.append(", ".join(line))
+        unsupported = [vt for vt in view_types if vt not in _VIEWABLE_FIELD_SET]
+        if unsupported:
+            return (
+                f"Error: Unsupported view type '{unsupported[0]}'. "
+                f"Supported types are: {VIEWABLE_FIELDS}"
+            )
+        # get the viewable info in a csv-like string, formatting each row in one go
+        buf = io.StringIO()
+        buf.write("Index, " + ", ".join(view_types))
+        row_template = "\n" + ", ".join(["%d"] + ["%s"] * len(view_types))
+        project = _make_projection(view_types)
+        for i, entry in enumerate(_iter_json_items(full_path)):
+            buf.write(row_template % (i, *project(entry)))
             if i + 1 >= lines:
                 break
-        return "\n".join(output_lines)
+        return buf.getvalue()
     except Exception as e:
         return f"Error reading file: {str(e)}"
     
@@ -276,24 +744,41 @@ def convert_all_data_to_structure_files(
         data_file: Relative path to the data file (JSON)
         target_format: Target structure file format (default: 'cif')
     """
-    full_path = settings.WORKSPACE_DIR / data_file
+    workspace_dir = settings.WORKSPACE_DIR
+    full_path = workspace_dir / data_file
     if not full_path.exists():
         return f"Error: File not found at {full_path}"
     
     try:
-        with open(full_path, "r") as f:
-            data = json.load(f)
-        
-        saved_files = []
+        data = _read_json(full_path)
+        output_dir = settings.OUTPUT_DIR
+
+        tasks = []
+        missing = []
         for entry in data:
-            structure_dict = entry.get("structure")
+            structure_dict = _load_entry_structure(entry, workspace_dir)
             file_name = entry.get("mpid", None)
             if structure_dict is None:
+                if file_name:
+                    missing.append(file_name)
                 continue
-            relative_path = _save_dict_to_file(structure_dict, target_format=target_format, file_name=file_name)
-            saved_files.append(str(relative_path))
-        
-        return f"Converted and saved {len(saved_files)} structures to {target_format} files under {settings.OUTPUT_DIR.relative_to(settings.WORKSPACE_DIR)}."
+            output_path = output_dir / _structure_file_name(structure_dict, file_name, target_format)
+            tasks.append((structure_dict, str(output_path), target_format))
+        # Results saved with fetch_structure=False: download all structures in one request.
+        if missing:
+            for file_name, structure_dict in _fetch_structures_by_mpid(missing).items():
+                output_path = output_dir / _structure_file_name(structure_dict, file_name, target_format)
+                tasks.append((structure_dict, str(output_path), target_format))
+
+        # Structure parsing and CIF formatting are CPU-bound pure Python, so large
+        # batches are spread over processes; small ones skip the pool start-up cost.
+        if len(tasks) < PARALLEL_CONVERT_MIN_ENTRIES:
+            for task in tasks:
+                _save_dict_to_file_worker(task)
+        else:
+            list(_get_convert_pool().map(_save_dict_to_file_worker, tasks, chunksize=8))
+
+        return f"Converted and saved {len(tasks)} structures to {target_format} files under {_rel(output_dir, workspace_dir)}."
     except Exception as e:
         return f"Error processing file: {str(e)}"
     
@@ -314,15 +799,24 @@ def convert_one_datus_to_structure_file(
         return f"Error: File not found at {full_path}"
     
     try:
-        with open(full_path, "r") as f:
-            data = json.load(f)
-        
-        if index < 0 or index >= len(data):
-            return f"Error: Index {index} out of range. File contains {len(data)} entries."
-        
-        entry = data[index]
-        structure_dict = entry.get("structure")
+        offsets = _read_entry_offsets(full_path)
+        if offsets is not None:
+            num_entries = len(offsets) - 1
+        else:
+            data = _read_json(full_path)
+            num_entries = len(data)
+
+        if index < 0 or index >= num_entries:
+            return f"Error: Index {index} out of range. File contains {num_entries} entries."
+
+        if offsets is not None:
+            entry = _read_entries_at(full_path, offsets, [index])[0]
+        else:
+            entry = data[index]
+        structure_dict = _load_entry_structure(entry)
         file_name = entry.get("mpid", None)
+        if structure_dict is None and file_name:
+            structure_dict = _fetch_structures_by_mpid([file_name]).get(file_name)
         if structure_dict is None:
             return f"Error: No structure found in entry at index {index}."
         
@@ -332,6 +826,65 @@ def convert_one_datus_to_structure_file(
         return f"Error processing file: {str(e)}"
 
 
+def _compile_filters(filters: dict):
+    """Return a predicate that is true for entries whose fields equal all ``filters``.
+
+    All filter fields are fetched with a single itemgetter call and compared as one
+    tuple, instead of a Python-level loop over the filters for every entry.
+    """
+    if not filters:
+        return lambda entry: True
+    getter = itemgetter(*filters)
+    expected = getter(filters)
+
+    def matches(entry: dict) -> bool:
+        try:
+            return getter(entry) == expected
+        except KeyError:
+            return False
+
+    return matches
+
+
+@lru_cache(maxsize=8)
+def _field_index(path: str, mtime_ns: int) -> dict:
+    """Inverted index ``{field: {value: [row ids]}}`` over the viewable fields of ``path``.
+
+    Cached per file path and mtime, so repeated sampling of the same file with
+    different filters scans it only once.
+    """
+    index = {field: {} for field in VIEWABLE_FIELDS}
+    for row, entry in enumerate(_iter_json_items(Path(path))):
+        for field, postings in index.items():
+            if field in entry:
+                postings.setdefault(entry[field], []).append(row)
+    return index
+
+
+def _indexed_matches(full_path: Path, filters: dict) -> list | None:
+    """Return the entries matching ``filters`` via the cached field index.
+
+    Returns None when the index cannot answer the query (no filters, a field
+    outside VIEWABLE_FIELDS or an unhashable value), so the caller should scan.
+    """
+    if not filters or not filters.keys() <= _VIEWABLE_FIELD_SET:
+        return None
+    index = _field_index(str(full_path), full_path.stat().st_mtime_ns)
+    try:
+        postings = sorted((index[field].get(value, ()) for field, value in filters.items()), key=len)
+    except TypeError:
+        return None
+    rows = set(postings[0]).intersection(*postings[1:])
+    if not rows:
+        return []
+    rows = sorted(rows)
+    offsets = _read_entry_offsets(full_path)
+    if offsets is not None:
+        return _read_entries_at(full_path, offsets, rows)
+    wanted = set(rows)
+    return [entry for row, entry in enumerate(_iter_json_items(full_path)) if row in wanted]
+
+
 def sample_data_from_json(data_file: str, **filters) -> str:
     """
     Sample/filter data from a JSON dataset based on target properties.
@@ -350,19 +903,11 @@ def sample_data_from_json(data_file: str, **filters) -> str:
         return f"Error: File not found at {full_path}"
     
     try:
-        with open(full_path, "r") as f:
-            data = json.load(f)
-        
-        # Filter the data based on provided filters
-        filtered_data = []
-        for entry in data:
-            match = True
-            for key, value in filters.items():
-                if key not in entry or entry[key] != value:
-                    match = False
-                    break
-            if match:
-                filtered_data.append(entry)
+        filtered_data = _indexed_matches(full_path, filters)
+        if filtered_data is None:
+            # Filter while streaming so only the matching entries are ever held in memory
+            matches = _compile_filters(filters)
+            filtered_data = [entry for entry in _iter_json_items(full_path) if matches(entry)]
         
         if not filtered_data:
             return f"No materials matched the specified filters in {data_file}."
@@ -371,8 +916,7 @@ def sample_data_from_json(data_file: str, **filters) -> str:
         original_stem = Path(data_file).stem
         sampled_filename = f"sampled_{original_stem}.json"
         sampled_path = settings.TEMP_DIR / sampled_filename
-        with open(sampled_path, "w") as f:
-            json.dump(filtered_data, f, default=str)
+        _write_json_entries(sampled_path, filtered_data)
         
         relative_path = sampled_path.relative_to(settings.WORKSPACE_DIR)
         return f"Sampled {len(filtered_data)} materials matching the filters. Results saved to {relative_path}."
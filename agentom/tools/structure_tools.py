@@ -1,18 +1,23 @@
 """
 Tools for working with ASE (Atomic Simulation Environment).
 """
+import copy
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from ase import Atoms
 from ase.io import read
 from ase.build import surface, make_supercell
 from ase.data import covalent_radii
-from ase.geometry import get_distances
+from ase.neighborlist import neighbor_list
 from ase.io import write
 from ase.visualize.plot import plot_atoms
 import numpy as np
 import os
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 from pymatgen.core.structure import Structure
 from pymatgen.analysis.interfaces.substrate_analyzer import SubstrateAnalyzer
@@ -22,6 +27,30 @@ from pymatgen.io.ase import AseAtomsAdaptor
 from agentom.settings import settings
 
 
+@lru_cache(maxsize=64)
+def _read_cached(path: str, mtime_ns: int, size: int) -> Atoms:
+    return read(path)
+
+
+def _read_atoms(path: Path) -> Atoms:
+    """Read ``path`` with ase.io.read, reusing the parse while the file is unchanged.
+
+    The cache is keyed on the file's mtime and size; callers get a deep copy so
+    in-place edits (supercells, translations, ...) never leak into the cache.
+    """
+    stat = os.stat(path)
+    return copy.deepcopy(_read_cached(os.fspath(path), stat.st_mtime_ns, stat.st_size))
+
+
+def _ensure_dir(path: Path) -> Path:
+    """Create ``path`` (with parents) if needed and return it.
+
+    Not cached: clear_temp or a session switch may delete the directory.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def _load_atoms(folder: str, file_name: str) -> Atoms:
     """Loads an ASE Atoms object from disk."""
     # Handle folder being "." or empty string
@@ -32,7 +61,7 @@ def _load_atoms(folder: str, file_name: str) -> Atoms:
         
     if not file_path.exists():
         return {"error": f"File not found: {file_path}"}
-    return read(file_path)
+    return _read_atoms(file_path)
 
 
 def _load_atoms_from_path(path_str: str) -> Atoms:
@@ -48,7 +77,7 @@ def _load_atoms_from_path(path_str: str) -> Atoms:
     # If the provided path exists as given (absolute or relative), use it.
     if p.exists():
         try:
-            return read(p)
+            return _read_atoms(p)
         except Exception as e:
             return {"error": str(e)}
 
@@ -56,7 +85,7 @@ def _load_atoms_from_path(path_str: str) -> Atoms:
     alt = settings.WORKSPACE_DIR / path_str
     if alt.exists():
         try:
-            return read(alt)
+            return _read_atoms(alt)
         except Exception as e:
             return {"error": str(e)}
 
@@ -80,10 +109,12 @@ def read_structure(folder: str, file_name: str) -> dict:
         "atoms": [
             {
                 "index": index,
-                "symbol": atom.symbol,
-                "position_angstrom": atoms.positions[index].tolist(),
+                "symbol": symbol,
+                "position_angstrom": position,
             }
-            for index, atom in enumerate(atoms)
+            for index, (symbol, position) in enumerate(
+                zip(atoms.get_chemical_symbols(), atoms.positions.tolist())
+            )
         ],
         "cell_vectors_angstrom": atoms.cell.array.tolist()
         if atoms.cell is not None
@@ -100,7 +131,12 @@ def read_structures_in_text(folder: str, file_name: str) -> dict:
         
     if not file_path.exists():
         return {"error": f"File not found: {file_path}"}
-    return {"raw_file_text": open(file_path, 'r').read()}
+    # One read + one decode instead of the incremental text layer; also closes the file
+    text = file_path.read_bytes().decode('utf-8', errors='replace')
+    if '\r' in text:
+        # Match the universal-newline translation of text-mode reads
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return {"raw_file_text": text}
 
 
 def calculate_distance(folder: str, file_name: str, index1: int, index2: int) -> dict:
@@ -116,17 +152,20 @@ def calculate_distance(folder: str, file_name: str, index1: int, index2: int) ->
 
     pos1 = atoms.positions[index1]
     pos2 = atoms.positions[index2]
-    distance = float(np.linalg.norm(pos1 - pos2))
+    delta = pos1 - pos2
+    distance = float(np.sqrt(delta @ delta))
+    # atoms.symbols indexes the numbers array directly, without an Atom proxy
+    symbols = atoms.symbols
     return {
         "file": file_name,
         "atom1": {
             "index": index1,
-            "symbol": atoms[index1].symbol,
+            "symbol": symbols[index1],
             "position_angstrom": pos1.tolist(),
         },
         "atom2": {
             "index": index2,
-            "symbol": atoms[index2].symbol,
+            "symbol": symbols[index2],
             "position_angstrom": pos2.tolist(),
         },
         "distance_angstrom": distance,
@@ -140,7 +179,9 @@ def build_supercell(folder: str, file_name: str, repetitions: list[int] | list[l
     if len(repetitions) != 3:
         return {"error": "Repetitions must be a list of three integers, or a 3x3 matrix."}
     
-    # if repetitions is a list of three integers, convert to a diagonal matrix
+    # if repetitions is a list of three integers, convert to a diagonal matrix.
+    # make_supercell is kept for this case too: it wraps atoms into the new cell,
+    # which atoms.repeat does not, and is no slower for diagonal matrices.
     if all(isinstance(x, int) for x in repetitions):
         repetitions = np.diag(repetitions)
 
@@ -149,9 +190,7 @@ def build_supercell(folder: str, file_name: str, repetitions: list[int] | list[l
         output_file_name = output_name
     else:
         output_file_name = f"supercell_{file_name}"
-    output_file_path = settings.OUTPUT_DIR / output_file_name
-    if not settings.OUTPUT_DIR.exists():
-        os.makedirs(settings.OUTPUT_DIR)
+    output_file_path = _ensure_dir(settings.OUTPUT_DIR) / output_file_name
     write(output_file_path, supercell_atoms)
     return {
         "original_file": file_name,
@@ -173,9 +212,7 @@ def build_surface(folder: str, file_name: str, miller_indices: list, layers: int
             output_file_name = output_name
         else:
             output_file_name = f"slab_{file_name}"
-        output_file_path = settings.OUTPUT_DIR / output_file_name
-        if not settings.OUTPUT_DIR.exists():
-            os.makedirs(settings.OUTPUT_DIR)
+        output_file_path = _ensure_dir(settings.OUTPUT_DIR) / output_file_name
         write(output_file_path, slab)
         return {
 			"original_file": file_name,
@@ -193,17 +230,20 @@ def generate_structure_image(folder: str, file_name: str, output_image_name: str
     if isinstance(atoms, dict) and "error" in atoms:
         return atoms
     
-    output_file_path = settings.OUTPUT_DIR / output_image_name
-    if not settings.OUTPUT_DIR.exists():
-        os.makedirs(settings.OUTPUT_DIR)
+    output_file_path = _ensure_dir(settings.OUTPUT_DIR) / output_image_name
         
     try:
-        # Use ASE's plot_atoms and matplotlib to save with custom DPI
-        fig, ax = plt.subplots()
+        # Use ASE's plot_atoms on a standalone Agg figure (no pyplot global state)
+        # and save with custom DPI; PNGs use a fast zlib level
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         plot_atoms(atoms, ax=ax, rotation=rotation)
         ax.axis('off')  # Remove coordinate axes
-        plt.savefig(output_file_path, dpi=dpi, bbox_inches='tight')
-        plt.close(fig)
+        save_kwargs = {}
+        if output_file_path.suffix.lower() == '.png':
+            save_kwargs['pil_kwargs'] = {'compress_level': 1, 'optimize': False}
+        fig.savefig(output_file_path, dpi=dpi, bbox_inches='tight', **save_kwargs)
         return {
             "original_file": file_name,
             "output_image_file": str(output_file_path.relative_to(settings.WORKSPACE_DIR)),
@@ -220,33 +260,41 @@ def check_close_atoms(folder: str, file_name: str, tolerance: float = -0.5) -> d
     if isinstance(atoms, dict) and "error" in atoms:
         return atoms
     
-    positions = atoms.positions
-    cell = atoms.cell
-    pbc = atoms.pbc
-    
-    distances, indices = get_distances(positions, cell=cell, pbc=pbc)
+    radii = covalent_radii[atoms.numbers]
+    cutoff = 2 * radii.max() + tolerance if len(atoms) > 1 else 0.0
+    if cutoff > 0:
+        # Cell-list neighbor search only visits pairs within the largest possible
+        # threshold, instead of building the full N x N distance matrix
+        iu, ju, dists = neighbor_list("ijd", atoms, cutoff, self_interaction=False)
+        # Apply the per-pair threshold before deduplicating, so only the (few) close
+        # images are sorted; the nearest image of a pair is close whenever any is
+        min_dists = radii[iu] + radii[ju] + tolerance
+        close = (iu < ju) & (dists < min_dists)
+        iu, ju, dists, min_dists = iu[close], ju[close], dists[close], min_dists[close]
+        # Keep the nearest periodic image of each pair (minimum-image convention)
+        order = np.lexsort((dists, ju, iu))
+        iu, ju, dists, min_dists = iu[order], ju[order], dists[order], min_dists[order]
+        first = np.ones(len(iu), dtype=bool)
+        first[1:] = (iu[1:] != iu[:-1]) | (ju[1:] != ju[:-1])
+        iu, ju, dists, min_dists = iu[first], ju[first], dists[first], min_dists[first]
+    else:
+        iu = ju = dists = min_dists = np.empty(0)
     
+    symbols = atoms.get_chemical_symbols()
     close_pairs = []
-    for i in range(len(atoms)):
-        for j in range(i+1, len(atoms)):
-            dist_vector = distances[i, j]
-            dist = float(np.linalg.norm(dist_vector))
-            r1 = covalent_radii[atoms[i].number]
-            r2 = covalent_radii[atoms[j].number]
-            min_dist = r1 + r2 + tolerance
-            if dist < min_dist:
-                close_pairs.append({
-                    "atom1": {
-                        "index": i,
-                        "symbol": atoms[i].symbol,
-                    },
-                    "atom2": {
-                        "index": j,
-                        "symbol": atoms[j].symbol,
-                    },
-                    "distance_angstrom": round(dist, 3),
-                    "min_distance_angstrom": round(float(min_dist), 3),
-                })
+    for i, j, dist, min_dist in zip(iu.tolist(), ju.tolist(), dists.tolist(), min_dists.tolist()):
+        close_pairs.append({
+            "atom1": {
+                "index": i,
+                "symbol": symbols[i],
+            },
+            "atom2": {
+                "index": j,
+                "symbol": symbols[j],
+            },
+            "distance_angstrom": round(dist, 3),
+            "min_distance_angstrom": round(min_dist, 3),
+        })
     num_close = len(close_pairs)
     return {
         "file": file_name,
@@ -257,6 +305,81 @@ def check_close_atoms(folder: str, file_name: str, tolerance: float = -0.5) -> d
 
 
 
+# ZSL matching runs twice per builder (SubstrateAnalyzer.calculate, then again in
+# CoherentInterfaceBuilder), so builders are reused across calls that only change
+# gap, vacuum or thickness.
+_INTERFACE_BUILDER_CACHE_SIZE = 32
+_interface_builders: OrderedDict = OrderedDict()
+_interface_builders_lock = threading.Lock()
+
+
+def _structure_key(structure: Structure) -> tuple:
+    # Site species rather than atomic_numbers, which raises on disordered sites
+    return (
+        structure.lattice.matrix.tobytes(),
+        tuple(site.species for site in structure),
+        structure.frac_coords.tobytes(),
+    )
+
+
+def _get_interface_builder(
+    film: Structure,
+    substrate: Structure,
+    film_miller,
+    substrate_miller,
+    max_area: Optional[float],
+    max_length_tol: Optional[float],
+    max_angle_tol: Optional[float],
+) -> Optional[CoherentInterfaceBuilder]:
+    """Return a CoherentInterfaceBuilder for the lowest-strain match, or None if
+    there is no match. Results are memoized per structures, Miller indices and
+    tolerances."""
+    key = (
+        _structure_key(film), _structure_key(substrate),
+        tuple(film_miller), tuple(substrate_miller),
+        max_area, max_length_tol, max_angle_tol,
+    )
+    with _interface_builders_lock:
+        if key in _interface_builders:
+            _interface_builders.move_to_end(key)
+            return _interface_builders[key]
+
+    # Find matches using SubstrateAnalyzer with parameters directly
+    analyzer = SubstrateAnalyzer(
+        max_area_ratio_tol=0.09,  # Default value; adjust if needed
+        max_area=max_area,
+        max_length_tol=max_length_tol,
+        max_angle_tol=max_angle_tol
+    )
+    # Use the lowest-strain match, consuming the generator without a sort
+    match = min(
+        analyzer.calculate(
+            film=film,
+            substrate=substrate,
+            film_millers=[film_miller],
+            substrate_millers=[substrate_miller]
+        ),
+        key=lambda m: m.von_mises_strain,
+        default=None,
+    )
+    builder = None
+    if match is not None:
+        # Initialize CoherentInterfaceBuilder without sl_vectors
+        builder = CoherentInterfaceBuilder(
+            film_structure=film,
+            substrate_structure=substrate,
+            film_miller=match.film_miller,
+            substrate_miller=match.substrate_miller,
+            zslgen=analyzer  # Pass the analyzer as zslgen to use the same matching parameters
+        )
+
+    with _interface_builders_lock:
+        _interface_builders[key] = builder
+        if len(_interface_builders) > _INTERFACE_BUILDER_CACHE_SIZE:
+            _interface_builders.popitem(last=False)
+    return builder
+
+
 def build_interface(
     film_structure: str,
     substrate_structure: str,
@@ -324,33 +447,12 @@ def build_interface(
         substrate_thickness = int(substrate_thickness)
 
 
-        # Find matches using SubstrateAnalyzer with parameters directly
-        analyzer = SubstrateAnalyzer(
-            max_area_ratio_tol=0.09,  # Default value; adjust if needed
-            max_area=max_area,
-            max_length_tol=max_length_tol,
-            max_angle_tol=max_angle_tol
+        builder = _get_interface_builder(
+            film, substrate, film_miller, substrate_miller,
+            max_area, max_length_tol, max_angle_tol
         )
-        matches = list(analyzer.calculate(
-            film=film,
-            substrate=substrate,
-            film_millers=[film_miller],
-            substrate_millers=[substrate_miller]
-        ))
-        if not matches:
+        if builder is None:
             return {"error": "No lattice matches found. Try adjusting tolerances or Miller indices."}
-        
-        # Use the first match (lowest strain preferred)
-        match = sorted(matches, key=lambda m: m.von_mises_strain)[0]
-
-        # Initialize CoherentInterfaceBuilder without sl_vectors
-        builder = CoherentInterfaceBuilder(
-            film_structure=film,
-            substrate_structure=substrate,
-            film_miller=match.film_miller,
-            substrate_miller=match.substrate_miller,
-            zslgen=analyzer  # Pass the analyzer as zslgen to use the same matching parameters
-        )
 
         # Get terminations
         terminations = builder.terminations
@@ -365,35 +467,33 @@ def build_interface(
         if vacuum_over_film == 0:
             effective_vacuum = gap  # Set to gap to symmetrize interfaces and prevent PBC overlap
 
-        # Generate interfaces
-        interfaces = list(builder.get_interfaces(
+        # Generate interfaces; only the first one is used, so stop after it
+        interface = next(builder.get_interfaces(
             termination=termination,
             gap=gap,
             vacuum_over_film=effective_vacuum,
             film_thickness=film_thickness,
             substrate_thickness=substrate_thickness,
             in_layers=in_layers
-        ))
+        ), None)
 
-        if not interfaces:
+        if interface is None:
             return{"error": "No interfaces generated. Check parameters."}
 
-        # Return the first interface
-        interface = interfaces[0]
-
         # Optional adjustments
         interface.translate_sites(range(len(interface)), [0, 0, 0])  # Translate for better visualization
     except Exception as e:
         return {"error": f"Error during matching: {str(e)}"}
     
     
+    output_dir = _ensure_dir(settings.OUTPUT_DIR)
     if output_file_name:
-        output_path = settings.OUTPUT_DIR / output_file_name
+        output_path = output_dir / output_file_name
     else:
         # get the names of the input files without extensions
         film_name = Path(film_structure).stem
         substrate_name = Path(substrate_structure).stem
-        output_path = settings.OUTPUT_DIR / f"{film_name}-{substrate_name}_interface.extxyz"
+        output_path = output_dir / f"{film_name}-{substrate_name}_interface.extxyz"
     
     try:
         interface = interface.to_ase_atoms()
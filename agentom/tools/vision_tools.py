@@ -1,17 +1,26 @@
-from litellm import completion
 import base64
+import mmap
 import os
+from functools import lru_cache
 from pathlib import Path
 
 from agentom.settings import settings
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 def encode_image(image_path):
     with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode('utf-8')
+        # Encode straight from a read-only mapping instead of reading a full copy first
+        try:
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return base64.b64encode(data).decode('ascii')
+        except ValueError:
+            # Empty files cannot be mapped
+            return ""
+
+
+@lru_cache(maxsize=16)
+def _image_data_url(path: str, mtime_ns: int, size: int) -> str:
+    """Encode an image once per file version; repeated inspections reuse the URL."""
+    return f"data:image/png;base64,{encode_image(path)}"
 
 
 def get_image_content(image_path: str) -> str:
@@ -23,7 +32,7 @@ def get_image_content(image_path: str) -> str:
         return f"Error: Image file not found at {full_path}"
     
     try:
-        base64_image = encode_image(full_path)
-        return f"data:image/png;base64,{base64_image}"
+        stat = full_path.stat()
+        return _image_data_url(str(full_path), stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         return f"Error reading image: {str(e)}"
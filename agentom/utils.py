@@ -6,76 +6,93 @@ Note: The agent entrypoint (``agentom.agent``) registers
 automatically removed on normal process exit or user-initiated
 interrupts (e.g. Ctrl+C).
 """
+import os
 import shutil
 import traceback
 from .settings import settings
 from agentom.logging_utils import logger
 
+__all__ = [
+    "clear_temp_dir",
+    "clear_input_dir",
+    "clear_output_dir",
+    "clear_workspace",
+    "transfer_outputs_to_target_dir",
+]
+
 # All the below logics are moved to middleware package's config and utils,
 # but kept here for backward compatibility and reference.
 
+def _clear_dir_contents(path, include_dirs: bool = True) -> bool:
+    """
+    Remove the entries of ``path`` while keeping ``path`` itself.
+    Uses os.scandir so the entry type comes from the directory listing instead of
+    a stat() per Path. Returns False if ``path`` does not exist.
+    """
+    try:
+        entries = os.scandir(path)
+    except FileNotFoundError:
+        return False
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if include_dirs:
+                        shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except Exception:
+                logger.exception("Failed to remove '%s'", entry.path)
+    return True
+
 def clear_temp_dir():
     """
     Clear all files and subdirectories in the temporary directory.
     This is useful for cleaning up after a run to free up space.
     """
-    if settings.TEMP_DIR.exists():
-        for item in settings.TEMP_DIR.iterdir():
-            try:
-                if item.is_file() or item.is_symlink():
-                    item.unlink()
-                elif item.is_dir():
-                    shutil.rmtree(item)
-            except Exception:
-                logger.exception("Failed to remove '%s'", item)
-        logger.info("Cleared temporary directory: %s", settings.TEMP_DIR)
+    temp_dir = settings.TEMP_DIR
+    if _clear_dir_contents(temp_dir):
+        logger.info("Cleared temporary directory: %s", temp_dir)
 
 def clear_input_dir():
     """
     Clear all files and subdirectories in the input directory.
     This is useful for cleaning up inputs from previous runs.
     """
-    if settings.INPUT_DIR.exists():
-        for item in settings.INPUT_DIR.iterdir():
-            try:
-                if item.is_file() or item.is_symlink():
-                    item.unlink()
-                elif item.is_dir():
-                    shutil.rmtree(item)
-            except Exception:
-                logger.exception("Failed to remove '%s'", item)
-        logger.info("Cleared input directory: %s", settings.INPUT_DIR)
+    input_dir = settings.INPUT_DIR
+    if _clear_dir_contents(input_dir):
+        logger.info("Cleared input directory: %s", input_dir)
 
 def clear_output_dir():
     """
     Clear all files and subdirectories in the output directory.
     This is useful for cleaning up outputs from previous runs.
     """
-    if settings.OUTPUT_DIR.exists():
-        for item in settings.OUTPUT_DIR.iterdir():
-            try:
-                if item.is_file() or item.is_symlink():
-                    item.unlink()
-                elif item.is_dir():
-                    shutil.rmtree(item)
-            except Exception:
-                logger.exception("Failed to remove '%s'", item)
-        logger.info("Cleared output directory: %s", settings.OUTPUT_DIR)
+    output_dir = settings.OUTPUT_DIR
+    if _clear_dir_contents(output_dir):
+        logger.info("Cleared output directory: %s", output_dir)
 
 
 def clear_workspace():
     """
     Clear all files and subdirectories in the workspace directory.
     """
-    if settings.WORKSPACE_DIR.exists():
-        # Remove all files and subdirectories inside the workspace
-        for item in settings.WORKSPACE_DIR.iterdir():
-            try:
-                if item.is_file() or item.is_symlink():
-                    item.unlink()
-            except Exception:
-                logger.exception("Failed to remove '%s'", item)
-        logger.info("Cleared workspace directory: %s", settings.WORKSPACE_DIR)
+    workspace_dir = settings.WORKSPACE_DIR
+    # Remove all files inside the workspace; subdirectories are kept
+    if _clear_dir_contents(workspace_dir, include_dirs=False):
+        logger.info("Cleared workspace directory: %s", workspace_dir)
+
+
+def _move(src, dest):
+    """
+    Move ``src`` to ``dest`` with a plain rename when possible.
+    Falls back to shutil.move (copy + delete) across filesystems or when the
+    rename is refused, e.g. because ``dest`` is an existing directory.
+    """
+    try:
+        os.replace(src, dest)
+    except OSError:
+        shutil.move(str(src), str(dest))
 
 
 def transfer_outputs_to_target_dir(target_dir: str):
@@ -89,14 +106,13 @@ def transfer_outputs_to_target_dir(target_dir: str):
     target_path = settings.WORKSPACE_DIR / target_dir / datetime_folder_name
     target_path.mkdir(parents=True, exist_ok=True)
 
-    if settings.OUTPUT_DIR.exists():
-        for item in settings.OUTPUT_DIR.iterdir():
+    output_dir = settings.OUTPUT_DIR
+    if output_dir.exists():
+        for item in output_dir.iterdir():
             try:
                 dest = target_path / item.name
-                if item.is_file():
-                    shutil.move(str(item), str(dest))
-                elif item.is_dir():
-                    shutil.move(str(item), str(dest))
+                if item.is_file() or item.is_dir():
+                    _move(item, dest)
             except Exception:
                 logger.exception("Failed to transfer '%s' to '%s'", item, target_path)
         logger.info("Transferred outputs to target directory: %s", target_path)
\ No newline at end of file
@@ -1,3 +1,6 @@
+import asyncio
+import queue
+import threading
 from collections import defaultdict
 from datetime import UTC, datetime
 from typing import Any
@@ -5,6 +8,9 @@ from typing import Any
 import mgclient
 from loguru import logger
 
+# Extra connections kept for concurrent read queries from async tools
+READ_POOL_SIZE = 8
+
 class MemgraphIngestor:
     """Handles all communication and query execution with the Memgraph database."""
 
@@ -15,6 +21,14 @@ class MemgraphIngestor:
         self.conn: mgclient.Connection | None = None
         self.node_buffer: list[tuple[str, dict[str, Any]]] = []
         self.relationship_buffer: list[tuple[tuple, str, tuple, dict | None]] = []
+        # mgclient connections are not thread-safe: async reads use self.conn
+        # while it is idle and otherwise borrow a connection from this pool
+        self._conn_lock = threading.Lock()
+        self._read_pool: queue.SimpleQueue[mgclient.Connection] = queue.SimpleQueue()
+        self._read_pool_lock = threading.Lock()
+        self._read_pool_created = 0
+        # Bumped on exit so connections returned afterwards are closed, not pooled
+        self._read_pool_generation = 0
 
     def __enter__(self) -> "MemgraphIngestor":
         logger.info(f"Connecting to Memgraph at {self._host}:{self._port}...")
@@ -32,17 +46,33 @@ class MemgraphIngestor:
                 exc_info=True,
             )
         self.flush_all()
+        with self._read_pool_lock:
+            # Idle connections are closed now, in-flight ones when returned
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._read_pool_generation += 1
+            self._read_pool_created = 0
         if self.conn:
-            self.conn.close()
+            with self._conn_lock:
+                self.conn.close()
             logger.info("\nDisconnected from Memgraph.")
 
-    def _execute_query(self, query: str, params: dict[str, Any] | None = None) -> list:
-        if not self.conn:
-            raise ConnectionError("Not connected to Memgraph.")
+    def _execute_query(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+        conn: mgclient.Connection | None = None,
+    ) -> list:
+        if conn is None:
+            with self._conn_lock:
+                return self._execute_query(query, params, self._require_conn())
         params = params or {}
         cursor = None
         try:
-            cursor = self.conn.cursor()
+            cursor = conn.cursor()
             cursor.execute(query, params)
             if not cursor.description:
                 return []
@@ -65,16 +95,17 @@ class MemgraphIngestor:
         if not self.conn or not params_list:
             return
         cursor = None
-        try:
-            cursor = self.conn.cursor()
-            batch_query = f"UNWIND $batch AS row\n{query}"
-            cursor.execute(batch_query, {"batch": params_list})
-        except Exception as e:
-            if "already exists" not in str(e).lower():
-                logger.error(f"!!! Batch Cypher Error: {e}")
-        finally:
-            if cursor:
-                cursor.close()
+        with self._conn_lock:
+            try:
+                cursor = self.conn.cursor()
+                batch_query = f"UNWIND $batch AS row\n{query}"
+                cursor.execute(batch_query, {"batch": params_list})
+            except Exception as e:
+                if "already exists" not in str(e).lower():
+                    logger.error(f"!!! Batch Cypher Error: {e}")
+            finally:
+                if cursor:
+                    cursor.close()
 
     def clean_database(self) -> None:
         logger.info("--- Cleaning database... ---")
@@ -174,6 +205,66 @@ class MemgraphIngestor:
         logger.debug(f"Executing fetch query: {query} with params: {params}")
         return self._execute_query(query, params)
 
+    async def fetch_all_async(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> list:
+        """
+        Like fetch_all, but runs in a worker thread on a pooled connection so
+        several queries from concurrent tool calls can be in flight at once.
+        """
+        logger.debug(f"Executing async fetch query: {query} with params: {params}")
+        return await asyncio.to_thread(self._fetch_pooled, query, params)
+
+    def _fetch_pooled(self, query: str, params: dict[str, Any] | None) -> list:
+        # The main connection serves reads while it is idle, so a single
+        # ingestor only opens extra connections under real concurrency
+        if self._conn_lock.acquire(blocking=False):
+            try:
+                return self._execute_query(query, params, self._require_conn())
+            finally:
+                self._conn_lock.release()
+        conn, generation = self._acquire_read_connection()
+        try:
+            return self._execute_query(query, params, conn)
+        finally:
+            self._release_read_connection(conn, generation)
+
+    def _require_conn(self) -> mgclient.Connection:
+        if not self.conn:
+            raise ConnectionError("Not connected to Memgraph.")
+        return self.conn
+
+    def _acquire_read_connection(self) -> tuple[mgclient.Connection, int]:
+        self._require_conn()
+        with self._read_pool_lock:
+            generation = self._read_pool_generation
+            pool = self._read_pool
+            try:
+                return pool.get_nowait(), generation
+            except queue.Empty:
+                pass
+            if self._read_pool_created < READ_POOL_SIZE:
+                conn = mgclient.connect(host=self._host, port=self._port)
+                conn.autocommit = True
+                self._read_pool_created += 1
+                return conn, generation
+        while True:
+            try:
+                return pool.get(timeout=1.0), generation
+            except queue.Empty:
+                # Stop waiting once the ingestor has been closed
+                if generation != self._read_pool_generation:
+                    raise ConnectionError("Not connected to Memgraph.") from None
+
+    def _release_read_connection(
+        self, conn: mgclient.Connection, generation: int
+    ) -> None:
+        with self._read_pool_lock:
+            if generation == self._read_pool_generation:
+                self._read_pool.put(conn)
+                return
+        conn.close()
+
     def execute_write(self, query: str, params: dict[str, Any] | None = None) -> None:
         """Executes a write query without returning results."""
         logger.debug(f"Executing write query: {query} with params: {params}")
@@ -1,7 +1,12 @@
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import cast
 
 from loguru import logger
 from pydantic_ai import Agent, Tool
+from pydantic_ai.models import Model
 from pydantic_ai.models.gemini import GeminiModel, GeminiModelSettings
 from pydantic_ai.models.openai import OpenAIModel
 from pydantic_ai.providers.google_gla import GoogleGLAProvider
@@ -52,11 +57,110 @@ def _clean_cypher_response(response_text: str) -> str:
     query = response_text.strip().replace("`", "")
     if query.startswith("cypher"):
         query = query[6:].strip()
+    # A trailing "//" comment would swallow the ";" appended below
+    query = _strip_cypher_comments(query).strip()
     if not query.endswith(";"):
         query += ";"
     return query
 
 
+DEFAULT_QUERY_LIMIT = 50
+
+
+# String literals and comments, in one pass so "//" inside a string stays a string
+_CYPHER_LITERAL_OR_COMMENT_RE = re.compile(
+    r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/""", re.DOTALL
+)
+# LIMIT as the last clause of the query
+_TRAILING_LIMIT_RE = re.compile(r"\bLIMIT\s+\S+\s*;?\s*$", re.IGNORECASE)
+
+
+def _strip_cypher_comments(query: str) -> str:
+    return _CYPHER_LITERAL_OR_COMMENT_RE.sub(
+        lambda m: "" if m.group(0).startswith("/") else m.group(0), query
+    )
+
+
+def _top_level_text(query: str) -> str:
+    """The query with string literals blanked and bracketed parts (subqueries,
+    patterns, maps, lists) removed, leaving only the top-level clauses."""
+    masked = _CYPHER_LITERAL_OR_COMMENT_RE.sub(
+        lambda m: "" if m.group(0).startswith("/") else "''", query
+    )
+    depth = 0
+    top: list[str] = []
+    for ch in masked:
+        if ch in "({[":
+            depth += 1
+        elif ch in ")}]":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            top.append(ch)
+    return "".join(top)
+
+
+def _ensure_limit(query: str) -> str:
+    """Caps queries the model left unbounded, so a vague question cannot dump the whole graph."""
+    query = _strip_cypher_comments(query).strip()
+    if _TRAILING_LIMIT_RE.search(_top_level_text(query)):
+        return query
+    return f"{query.rstrip(';').rstrip()} LIMIT {DEFAULT_QUERY_LIMIT};"
+
+
+MAX_PATH_HOPS = 4
+
+# Variable-length relationships without an upper bound: [*], [:CALLS*], [*2..], [*..]
+_UNBOUNDED_HOPS_RE = re.compile(r"\*\s*(\d*)\s*(\.\.)?(?=\s*\])")
+
+
+def _bound_path(match: re.Match[str]) -> str:
+    lower, dots = match.group(1), match.group(2)
+    if lower and not dots:
+        return match.group(0)  # exact hop count, already bounded
+    lower_hops = int(lower or 1)
+    return f"*{lower_hops}..{max(lower_hops, MAX_PATH_HOPS)}"
+
+
+def _rewrite_cypher(query: str) -> str:
+    """
+    Rewrites common expensive patterns in generated Cypher before it reaches Memgraph:
+    unbounded variable-length paths get an upper bound and a LIMIT is added.
+
+    Whole nodes in RETURN are left alone: the prompts already ask for projected
+    properties, and a fixed projection would drop any others the query needs.
+    """
+    # Swap string literals for placeholders so their contents are never rewritten
+    literals: list[str] = []
+
+    def stash(match: re.Match[str]) -> str:
+        if match.group(0).startswith("/"):
+            return ""
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    query = _CYPHER_LITERAL_OR_COMMENT_RE.sub(stash, query)
+    query = _UNBOUNDED_HOPS_RE.sub(_bound_path, query)
+    query = re.sub(r"\x00(\d+)\x00", lambda m: literals[int(m.group(1))], query)
+    return _ensure_limit(query)
+
+
+def _looks_like_cypher(output: object) -> bool:
+    return isinstance(output, str) and "MATCH" in output.upper()
+
+
+CYPHER_CACHE_MAX_ENTRIES = 512
+CYPHER_CACHE_TTL_SECONDS = 3600.0
+
+# Translations shared by every CypherGenerator, keyed by (model, normalized query).
+# Only the Cypher text is reused; queries always run against the current graph.
+_cypher_cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+
+
+def _normalize_query(natural_language_query: str) -> str:
+    # Whitespace only: names in the question end up in case-sensitive Cypher matches
+    return " ".join(natural_language_query.split())
+
+
 class CypherGenerator:
     """Generates Cypher queries from natural language."""
 
@@ -109,27 +213,56 @@ class CypherGenerator:
                 output_type=str,
                 model_settings=model_settings,
             )
+            self._cache_namespace = f"{settings.LLM_PROVIDER}:{llm.model_name}"
         except Exception as e:
             raise LLMGenerationError(
                 f"Failed to initialize CypherGenerator: {e}"
             ) from e
 
+    def _cached(self, key: tuple[str, str]) -> str | None:
+        entry = _cypher_cache.get(key)
+        if entry is None:
+            return None
+        created, query = entry
+        if time.monotonic() - created > CYPHER_CACHE_TTL_SECONDS:
+            del _cypher_cache[key]
+            return None
+        _cypher_cache.move_to_end(key)
+        return query
+
+    def _remember(self, key: tuple[str, str], query: str) -> None:
+        _cypher_cache[key] = (time.monotonic(), query)
+        _cypher_cache.move_to_end(key)
+        while len(_cypher_cache) > CYPHER_CACHE_MAX_ENTRIES:
+            _cypher_cache.popitem(last=False)
+
     async def generate(self, natural_language_query: str) -> str:
+        key = (self._cache_namespace, _normalize_query(natural_language_query))
+        cached = self._cached(key)
+        if cached is not None:
+            logger.info("  [CypherGenerator] Cache hit for: '{}'", natural_language_query)
+            return cached
+
         logger.info(
-            f"  [CypherGenerator] Generating query for: '{natural_language_query}'"
+            "  [CypherGenerator] Generating query for: '{}'", natural_language_query
         )
         try:
             result = await self.agent.run(natural_language_query)
-            if (
-                not isinstance(result.output, str)
-                or "MATCH" not in result.output.upper()
-            ):
+            if not _looks_like_cypher(result.output):
+                # One correction turn before giving up
+                result = await self.agent.run(
+                    "Your previous reply was not a Cypher query. Respond with only "
+                    "a single read-only Cypher query starting with MATCH.",
+                    message_history=result.all_messages(),
+                )
+            if not _looks_like_cypher(result.output):
                 raise LLMGenerationError(
                     f"LLM did not generate a valid query. Output: {result.output}"
                 )
 
-            query = _clean_cypher_response(result.output)
-            logger.info(f"  [CypherGenerator] Generated Cypher: {query}")
+            query = _rewrite_cypher(_clean_cypher_response(result.output))
+            logger.info("  [CypherGenerator] Generated Cypher: {}", query)
+            self._remember(key, query)
             return query
         except Exception as e:
             logger.error(
@@ -138,50 +271,57 @@ class CypherGenerator:
             raise LLMGenerationError(f"Cypher generation failed: {e}") from e
 
 
+@lru_cache(maxsize=1)
+def _orchestrator_model() -> tuple[Model, GeminiModelSettings | None]:
+    """Build the orchestrator model once per process; agents built per request share it."""
+    model_settings = None
+    if settings.LLM_PROVIDER == "gemini":
+        if settings.GEMINI_PROVIDER == "vertex":
+            provider = GoogleVertexProvider(
+                project_id=settings.GCP_PROJECT_ID,
+                region=cast(VertexAiRegion, settings.GCP_REGION),
+                service_account_file=settings.GCP_SERVICE_ACCOUNT_FILE,
+            )
+        else:
+            provider = GoogleGLAProvider(api_key=settings.GEMINI_API_KEY)  # type: ignore
+
+        if settings.GEMINI_THINKING_BUDGET is not None:
+            model_settings = GeminiModelSettings(
+                gemini_thinking_config={
+                    "thinking_budget": int(settings.GEMINI_THINKING_BUDGET)
+                }
+            )
+
+        llm = GeminiModel(
+            settings.GEMINI_MODEL_ID,
+            provider=provider,
+        )
+    elif settings.LLM_PROVIDER == "deepseek":  # deepseek
+        llm = OpenAIModel(
+            settings.DEEPSEEK_MODEL_ID,
+            provider=OpenAIProvider(
+                api_key=settings.DEEPSEEK_API_KEY,
+                base_url="https://api.deepseek.com/v1"
+            ),
+        )
+    else:  # local provider
+        llm = OpenAIModel(  # type: ignore
+            settings.LOCAL_ORCHESTRATOR_MODEL_ID,
+            provider=OpenAIProvider(
+                api_key=settings.LOCAL_MODEL_API_KEY,
+                base_url=str(settings.LOCAL_MODEL_ENDPOINT),
+            ),
+        )
+
+    return llm, model_settings
+
+
 def create_rag_orchestrator(
     tools: list[Tool], system_prompt: str | None = None
 ) -> Agent:
     """Factory function to create the main RAG orchestrator agent."""
     try:
-        model_settings = None
-        if settings.LLM_PROVIDER == "gemini":
-            if settings.GEMINI_PROVIDER == "vertex":
-                provider = GoogleVertexProvider(
-                    project_id=settings.GCP_PROJECT_ID,
-                    region=cast(VertexAiRegion, settings.GCP_REGION),
-                    service_account_file=settings.GCP_SERVICE_ACCOUNT_FILE,
-                )
-            else:
-                provider = GoogleGLAProvider(api_key=settings.GEMINI_API_KEY)  # type: ignore
-
-            if settings.GEMINI_THINKING_BUDGET is not None:
-                model_settings = GeminiModelSettings(
-                    gemini_thinking_config={
-                        "thinking_budget": int(settings.GEMINI_THINKING_BUDGET)
-                    }
-                )
-
-            llm = GeminiModel(
-                settings.GEMINI_MODEL_ID,
-                provider=provider,
-            )
-        elif settings.LLM_PROVIDER == "deepseek":  # deepseek
-            llm = OpenAIModel(
-                settings.DEEPSEEK_MODEL_ID,
-                provider=OpenAIProvider(
-                    api_key=settings.DEEPSEEK_API_KEY,
-                    base_url="https://api.deepseek.com/v1"
-                ),
-            )
-        else:  # local provider
-            llm = OpenAIModel(  # type: ignore
-                settings.LOCAL_ORCHESTRATOR_MODEL_ID,
-                provider=OpenAIProvider(
-                    api_key=settings.LOCAL_MODEL_API_KEY,
-                    base_url=str(settings.LOCAL_MODEL_ENDPOINT),
-                ),
-            )
-
+        llm, model_settings = _orchestrator_model()
         return Agent(
             model=llm,
             system_prompt=system_prompt or RAG_ORCHESTRATOR_RETRIVAL_PROMPT,
@@ -1,52 +1,90 @@
-from typing import Any
+from functools import lru_cache
+from typing import Any, Literal
 
 from .graph_updater import MemgraphIngestor
 from .services.llm import CypherGenerator, create_rag_orchestrator
 from .tools.code_retrieval import CodeRetriever, create_code_retrieval_tool
-from .tools.codebase_query import create_query_tool
-from .tools.directory_lister import DirectoryLister, create_directory_lister_tool
+from .tools.codebase_query import create_query_batch_tool, create_query_tool
+from .tools.directory_lister import (
+    DirectoryLister,
+    create_directory_lister_tool,
+    create_repo_file_lister_tool,
+)
 from .tools.document_analyzer import DocumentAnalyzer, create_document_analyzer_tool
 from .tools.file_editor import FileEditor, create_file_editor_tool
-from .tools.file_reader import FileReader, create_file_reader_tool
+from .tools.file_reader import (
+    FileReader,
+    create_file_batch_reader_tool,
+    create_file_reader_tool,
+)
 from .tools.file_writer import FileWriter, create_file_writer_tool
 from .tools.shell_command import ShellCommander, create_shell_command_tool
 from .config import settings
 from .prompts import RAG_ORCHESTRATOR_FINAL_PROMPT
 
 
-def initialize_rag_agent(repo_path: str, ingestor: MemgraphIngestor) -> Any:
-    """Initialize services and create the RAG agent for tool-style usage."""
-    cypher_generator = CypherGenerator()
-    code_retriever = CodeRetriever(project_root=repo_path, ingestor=ingestor)
+@lru_cache(maxsize=1)
+def _cypher_generator() -> CypherGenerator:
+    """One CypherGenerator per process; its model client is reused across requests."""
+    return CypherGenerator()
+
+
+@lru_cache(maxsize=8)
+def _document_analyzer(repo_path: str) -> DocumentAnalyzer:
+    """One DocumentAnalyzer per repository, so its LLM client is built only once."""
+    return DocumentAnalyzer(project_root=repo_path)
+
+
+@lru_cache(maxsize=8)
+def _file_editor(repo_path: str) -> FileEditor:
+    """One FileEditor per repository; it loads every Tree-sitter grammar on creation."""
+    return FileEditor(project_root=repo_path)
+
+
+RagAgentMode = Literal["read", "write"]
+
+
+def initialize_rag_agent(
+    repo_path: str, ingestor: MemgraphIngestor, mode: RagAgentMode = "write"
+) -> Any:
+    """
+    Initialize services and create the RAG agent for tool-style usage.
+
+    Every bound tool's schema is sent with each model request, so the agent only
+    gets the tools its mode needs: "read" answers questions about the code, and
+    "write" can also edit files and run shell commands.
+    """
     file_reader = FileReader(project_root=repo_path)
-    file_writer = FileWriter(project_root=repo_path)
-    file_editor = FileEditor(project_root=repo_path)
-    shell_commander = ShellCommander(
-        project_root=repo_path, timeout=settings.SHELL_COMMAND_TIMEOUT
-    )
     directory_lister = DirectoryLister(project_root=repo_path)
-    document_analyzer = DocumentAnalyzer(project_root=repo_path)
+    document_analyzer = _document_analyzer(repo_path)
+    cypher_generator = _cypher_generator()
+    code_retriever = CodeRetriever(project_root=repo_path, ingestor=ingestor)
+
+    tools = [
+        create_file_reader_tool(file_reader),
+        create_file_batch_reader_tool(file_reader),
+        create_directory_lister_tool(directory_lister),
+        create_repo_file_lister_tool(directory_lister),
+        create_document_analyzer_tool(document_analyzer),
+        create_query_tool(ingestor, cypher_generator),
+        create_query_batch_tool(ingestor, cypher_generator),
+        create_code_retrieval_tool(code_retriever),
+    ]
 
-    query_tool = create_query_tool(ingestor, cypher_generator)
-    code_tool = create_code_retrieval_tool(code_retriever)
-    file_reader_tool = create_file_reader_tool(file_reader)
-    file_writer_tool = create_file_writer_tool(file_writer)
-    file_editor_tool = create_file_editor_tool(file_editor)
-    shell_command_tool = create_shell_command_tool(shell_commander)
-    directory_lister_tool = create_directory_lister_tool(directory_lister)
-    document_analyzer_tool = create_document_analyzer_tool(document_analyzer)
+    if mode == "write":
+        file_writer = FileWriter(project_root=repo_path)
+        file_editor = _file_editor(repo_path)
+        shell_commander = ShellCommander(
+            project_root=repo_path, timeout=settings.SHELL_COMMAND_TIMEOUT
+        )
+        tools += [
+            create_file_writer_tool(file_writer),
+            create_file_editor_tool(file_editor),
+            create_shell_command_tool(shell_commander),
+        ]
 
     rag_agent = create_rag_orchestrator(
-        tools=[
-            query_tool,
-            code_tool,
-            file_reader_tool,
-            file_writer_tool,
-            file_editor_tool,
-            shell_command_tool,
-            directory_lister_tool,
-            document_analyzer_tool,
-        ],
+        tools=tools,
         system_prompt=RAG_ORCHESTRATOR_FINAL_PROMPT,
     )
     return rag_agent
@@ -1,3 +1,7 @@
+import asyncio
+import re
+from typing import Any
+
 from loguru import logger
 from pydantic_ai import Tool
 
@@ -12,6 +16,204 @@ class GraphQueryError(Exception):
     pass
 
 
+_STRING_LITERAL_RE = re.compile(r"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"")
+_ESCAPE_RE = re.compile(r"\\(.)")
+_ESCAPES = {"\\": "\\", "'": "'", '"': '"', "n": "\n", "t": "\t", "r": "\r"}
+
+
+def _parameterize_cypher(query: str) -> tuple[str, dict[str, Any]]:
+    """
+    Replaces string literals in a generated query with $parameters.
+
+    Questions that differ only in names or keywords then produce the same query
+    text, so Memgraph can reuse its cached plan instead of planning each one.
+    Literals with escapes other than the common ones are left in place.
+    """
+    params: dict[str, Any] = {}
+
+    def replace(match: re.Match[str]) -> str:
+        body = match.group(1) if match.group(1) is not None else match.group(2)
+        if any(escape not in _ESCAPES for escape in _ESCAPE_RE.findall(body)):
+            return match.group(0)
+        name = f"p{len(params)}"
+        params[name] = _ESCAPE_RE.sub(lambda m: _ESCAPES[m.group(1)], body)
+        return f"${name}"
+
+    return _STRING_LITERAL_RE.sub(replace, query), params
+
+
+_PARAM_RE = re.compile(r"\$(p\d+)\b")
+_FINAL_RETURN_RE = re.compile(
+    r"\bRETURN\s+(?P<items>.+?)(?P<tail>\s+(?:ORDER\s+BY|SKIP|LIMIT)\b.*)?$",
+    re.IGNORECASE | re.DOTALL,
+)
+_RETURN_ITEM_RE = re.compile(
+    r"^\s*(?P<expr>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?)(?:\s+AS\s+(?P<alias>[A-Za-z_]\w*))?\s*$",
+    re.IGNORECASE,
+)
+_UNBATCHABLE_RE = re.compile(
+    r"\b(?:UNION|CALL|RETURN\s+DISTINCT)\b|['\"`]", re.IGNORECASE
+)
+_BATCH_INDEX = "batch_index"
+
+
+def _unwind_batch(
+    query: str, params_list: list[dict[str, Any]]
+) -> tuple[str, dict[str, Any]] | None:
+    """
+    Folds several runs of one parameterized lookup into a single UNWIND query.
+
+    Each parameter set is handled by a CALL subquery, so LIMIT and ORDER BY
+    still apply per question, and every row carries _BATCH_INDEX to say which
+    parameter set produced it. Only plain lookups returning variables or
+    properties are folded; anything else returns None and runs one by one.
+    """
+    body = query.strip().rstrip(";")
+    if _UNBATCHABLE_RE.search(body) or _BATCH_INDEX in body:
+        return None
+    # Without UNION or subqueries a read query has a single RETURN
+    final = _FINAL_RETURN_RE.search(body)
+    if not final:
+        return None
+    items = [_RETURN_ITEM_RE.match(item) for item in final["items"].split(",")]
+    if not all(items):
+        return None
+    # Subquery results must be named; keep the names a single run would report
+    columns = [item["alias"] or item["expr"] for item in items]
+    projection = ", ".join(
+        f"{item['expr']} AS `{column}`" for item, column in zip(items, columns)
+    )
+    body = f"{body[: final.start()]}RETURN {projection}{final['tail'] or ''}"
+    body = _PARAM_RE.sub(rf"$batch[{_BATCH_INDEX}].\1", body)
+    outer_columns = ", ".join(f"`{column}`" for column in columns)
+    return (
+        f"UNWIND range(0, size($batch) - 1) AS {_BATCH_INDEX} "
+        f"CALL {{ WITH {_BATCH_INDEX} {body} }} "
+        f"RETURN {_BATCH_INDEX}, {outer_columns};",
+        {"batch": params_list},
+    )
+
+
+def _query_succeeded(cypher_query: str, results: list[dict[str, Any]]) -> GraphData:
+    summary = f"Successfully retrieved {len(results)} item(s) from the graph."
+    return GraphData(query_used=cypher_query, results=results, summary=summary)
+
+
+def _translation_failed(e: Exception) -> GraphData:
+    return GraphData(
+        query_used="N/A",
+        results=[],
+        summary=f"I couldn't translate your request into a database query. Error: {e}",
+    )
+
+
+def _query_failed(cypher_query: str, e: Exception) -> GraphData:
+    logger.error(f"[Tool:QueryGraph] Error during query execution: {e}", exc_info=True)
+    return GraphData(
+        query_used=cypher_query,
+        results=[],
+        summary=f"There was an error querying the database: {e}",
+    )
+
+
+async def _query_graph(
+    ingestor: MemgraphIngestor,
+    cypher_gen: CypherGenerator,
+    natural_language_query: str,
+) -> GraphData:
+    """Translates one question to Cypher and runs it against the graph."""
+    logger.info("[Tool:QueryGraph] Received NL query: '{}'", natural_language_query)
+    cypher_query = "N/A"
+    try:
+        cypher_query = await cypher_gen.generate(natural_language_query)
+        results = await ingestor.fetch_all_async(*_parameterize_cypher(cypher_query))
+        return _query_succeeded(cypher_query, results)
+    except LLMGenerationError as e:
+        return _translation_failed(e)
+    except Exception as e:
+        return _query_failed(cypher_query, e)
+
+
+async def _run_same_shape(
+    ingestor: MemgraphIngestor,
+    query: str,
+    runs: list[tuple[str, dict[str, Any]]],
+) -> list[GraphData]:
+    """Runs one parameterized query for each (cypher_query, params) in ``runs``."""
+    batch = (
+        _unwind_batch(query, [params for _, params in runs]) if len(runs) > 1 else None
+    )
+    if batch is not None:
+        try:
+            rows = await ingestor.fetch_all_async(*batch)
+        except Exception as e:
+            logger.warning(
+                f"[Tool:QueryGraph] Batched lookup failed, running singly: {e}"
+            )
+        else:
+            results: list[list[dict[str, Any]]] = [[] for _ in runs]
+            for row in rows:
+                results[row.pop(_BATCH_INDEX)].append(row)
+            return [
+                _query_succeeded(cypher_query, rows)
+                for (cypher_query, _), rows in zip(runs, results)
+            ]
+
+    async def run_one(cypher_query: str, params: dict[str, Any]) -> GraphData:
+        try:
+            return _query_succeeded(
+                cypher_query, await ingestor.fetch_all_async(query, params)
+            )
+        except Exception as e:
+            return _query_failed(cypher_query, e)
+
+    return list(await asyncio.gather(*(run_one(*run) for run in runs)))
+
+
+async def _query_graph_batch(
+    ingestor: MemgraphIngestor,
+    cypher_gen: CypherGenerator,
+    natural_language_queries: list[str],
+) -> list[GraphData]:
+    """
+    Translates several questions concurrently, then runs their queries.
+
+    Questions whose queries differ only in literal values (one lookup per
+    class or file, say) are sent to Memgraph as a single UNWIND query.
+    """
+    logger.info(
+        "[Tool:QueryGraph] Received {} NL queries", len(natural_language_queries)
+    )
+    translations = await asyncio.gather(
+        *(cypher_gen.generate(q) for q in natural_language_queries),
+        return_exceptions=True,
+    )
+    answers: list[GraphData | None] = [None] * len(natural_language_queries)
+    # Parameterized query text -> indices of the questions that produced it
+    shapes: dict[str, list[int]] = {}
+    runs: dict[int, tuple[str, dict[str, Any]]] = {}
+    for i, translation in enumerate(translations):
+        if isinstance(translation, LLMGenerationError):
+            answers[i] = _translation_failed(translation)
+        elif isinstance(translation, BaseException):
+            answers[i] = _query_failed("N/A", translation)
+        else:
+            query, params = _parameterize_cypher(translation)
+            runs[i] = (translation, params)
+            shapes.setdefault(query, []).append(i)
+
+    shape_answers = await asyncio.gather(
+        *(
+            _run_same_shape(ingestor, query, [runs[i] for i in indices])
+            for query, indices in shapes.items()
+        )
+    )
+    for indices, results in zip(shapes.values(), shape_answers):
+        for i, answer in zip(indices, results):
+            answers[i] = answer
+    return answers
+
+
 def create_query_tool(
     ingestor: MemgraphIngestor,
     cypher_gen: CypherGenerator,
@@ -36,28 +238,7 @@ def create_query_tool(
         - "Show me functions with the longest call chains"
         - "Which files contain functions related to database operations"
         """
-        logger.info(f"[Tool:QueryGraph] Received NL query: '{natural_language_query}'")
-        cypher_query = "N/A"
-        try:
-            cypher_query = await cypher_gen.generate(natural_language_query)
-            results = ingestor.fetch_all(cypher_query)
-            summary = f"Successfully retrieved {len(results)} item(s) from the graph."
-            return GraphData(query_used=cypher_query, results=results, summary=summary)
-        except LLMGenerationError as e:
-            return GraphData(
-                query_used="N/A",
-                results=[],
-                summary=f"I couldn't translate your request into a database query. Error: {e}",
-            )
-        except Exception as e:
-            logger.error(
-                f"[Tool:QueryGraph] Error during query execution: {e}", exc_info=True
-            )
-            return GraphData(
-                query_used=cypher_query,
-                results=[],
-                summary=f"There was an error querying the database: {e}",
-            )
+        return await _query_graph(ingestor, cypher_gen, natural_language_query)
 
     return Tool(
         function=query_codebase_knowledge_graph,
@@ -69,3 +250,37 @@ def create_query_tool(
             "call chains'."
         ),
     )
+
+
+def create_query_batch_tool(
+    ingestor: MemgraphIngestor,
+    cypher_gen: CypherGenerator,
+) -> Tool:
+    """
+    Factory function that creates the batched knowledge graph query tool,
+    injecting its dependencies.
+    """
+
+    async def query_codebase_knowledge_graph_batch(
+        natural_language_queries: list[str],
+    ) -> list[GraphData]:
+        """
+        Answers several independent questions about the codebase in one call.
+
+        The questions are translated concurrently, and lookups of the same shape
+        run as one graph query, so asking about N entities costs one tool call
+        instead of N. Results are returned in the same order as the questions.
+        """
+        unique_queries = list(dict.fromkeys(natural_language_queries))
+        answers = await _query_graph_batch(ingestor, cypher_gen, unique_queries)
+        by_query = dict(zip(unique_queries, answers))
+        return [by_query[q] for q in natural_language_queries]
+
+    return Tool(
+        function=query_codebase_knowledge_graph_batch,
+        description=(
+            "Query the codebase knowledge graph with several independent natural "
+            "language questions at once, e.g. one question per class or file you "
+            "need to locate. Returns one result per question, in order."
+        ),
+    )
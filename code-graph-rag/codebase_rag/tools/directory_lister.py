@@ -4,6 +4,41 @@ from pathlib import Path
 from loguru import logger
 from pydantic_ai import Tool
 
+# Directories never worth listing for the agent (same set GraphUpdater skips, plus .tmp)
+IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        "venv",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+        "build",
+        "dist",
+        ".eggs",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".ruff_cache",
+        ".claude",
+        ".tmp",
+    }
+)
+MAX_LISTED_FILES = 500
+
+
+def _sorted_entries(path: str | Path):
+    """Iterate a directory's entries in the order their relative paths sort.
+
+    scandir reuses the file types from the directory read, so no stat() call
+    is needed per entry. Directories sort as "<name>/", the prefix of every path
+    beneath them.
+    """
+    with os.scandir(path) as it:
+        entries = list(it)
+    entries.sort(
+        key=lambda entry: f"{entry.name}/" if entry.is_dir(follow_symlinks=False) else entry.name
+    )
+    return iter(entries)
+
 
 class DirectoryLister:
     def __init__(self, project_root: str):
@@ -31,6 +66,45 @@ class DirectoryLister:
             logger.error(f"Error listing directory {directory_path}: {e}")
             return f"Error: Could not list contents of '{directory_path}'."
 
+    def list_repo_files(self, directory_path: str = ".") -> str:
+        """
+        Recursively lists the files under a directory as paths relative to the
+        project root, one per line.
+        """
+        try:
+            target_path = self._get_safe_path(directory_path)
+            logger.info(f"Listing files under: {target_path}")
+            if not target_path.is_dir():
+                return f"Error: '{directory_path}' is not a valid directory."
+
+            files: list[str] = []
+            # Entries are visited in sorted order, so the listing is the start of
+            # the full sorted listing; one file past the cap marks truncation
+            pending = [_sorted_entries(target_path)]
+            while pending and len(files) <= MAX_LISTED_FILES:
+                entry = next(pending[-1], None)
+                if entry is None:
+                    pending.pop()
+                elif entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        pending.append(_sorted_entries(entry.path))
+                elif entry.is_file():
+                    files.append(os.path.relpath(entry.path, self.project_root))
+
+            if not files:
+                return f"No files found under '{directory_path}'."
+            listing = "\n".join(files[:MAX_LISTED_FILES])
+            if len(files) > MAX_LISTED_FILES:
+                listing += f"\n... (stopped after {MAX_LISTED_FILES} files; list a subdirectory for more)"
+            return listing
+
+        except PermissionError as e:
+            logger.error(f"Access denied listing files under {directory_path}: {e}")
+            return "Error: Access denied. Path is outside the project root."
+        except Exception as e:
+            logger.error(f"Error listing files under {directory_path}: {e}")
+            return f"Error: Could not list files under '{directory_path}'."
+
     def _get_safe_path(self, file_path: str) -> Path:
         """
         Resolves the file path relative to the root and ensures it's within
@@ -59,3 +133,10 @@ def create_directory_lister_tool(directory_lister: DirectoryLister) -> Tool:
         function=directory_lister.list_directory_contents,
         description="Lists the contents of a directory to explore the codebase.",
     )
+
+
+def create_repo_file_lister_tool(directory_lister: DirectoryLister) -> Tool:
+    return Tool(
+        function=directory_lister.list_repo_files,
+        description="Recursively lists all files under a directory (default: the whole repository) in one call, as paths relative to the project root.",
+    )
@@ -1,7 +1,11 @@
+import asyncio
+import hashlib
+import json
 import mimetypes
 import os
 import shutil
-import uuid
+import time
+from functools import lru_cache
 from pathlib import Path
 
 from loguru import logger
@@ -11,6 +15,61 @@ from pydantic_ai.providers.openai import OpenAIProvider
 
 from ..config import settings
 
+ANALYSIS_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Lifetime of the Gemini context cache holding a document's bytes
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = 3600
+# Copies of external documents in .tmp are removed once unused for this long
+TMP_COPY_TTL_SECONDS = 24 * 3600
+# Minimum time between sweeps of .tmp for expired copies and cached answers
+TMP_PRUNE_INTERVAL_SECONDS = 3600
+
+_TEXT_EXTENSIONS = frozenset(
+    {".txt", ".md", ".rst", ".py", ".json", ".toml", ".yaml", ".yml", ".ini", ".cfg", ".csv"}
+)
+
+mimetypes.init()
+
+
+@lru_cache(maxsize=4096)
+def _mime_type(path: Path) -> str:
+    mime_type, _ = mimetypes.guess_type(path)
+    # Default if type can't be guessed
+    return mime_type or "application/octet-stream"
+
+
+def _copy_file_atomic(source: Path, target: Path) -> None:
+    """Copy ``source`` to ``target`` so readers never see a partial file."""
+    partial = target.with_name(f"{target.name}.{os.getpid()}.partial")
+    try:
+        shutil.copyfile(source, partial)
+        os.replace(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+
+
+def _prune_tmp_dir(tmp_dir: Path, cache_dir: Path) -> None:
+    """Delete document copies and cached answers that have expired."""
+    now = time.time()
+    for directory, ttl in (
+        (tmp_dir, TMP_COPY_TTL_SECONDS),
+        (cache_dir, ANALYSIS_CACHE_TTL_SECONDS),
+    ):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file() and now - entry.stat().st_mtime > ttl:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def _file_sha256(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
 
 class DocumentAnalyzer:
     """
@@ -56,17 +115,111 @@ class DocumentAnalyzer:
             )
             self.text_agent = Agent(model=model, system_prompt="You analyze documents.")
 
+        self.cache_dir = self.project_root / ".tmp" / "doc_cache"
+        # {document sha256: (cached content name or None, expiry in monotonic time)}
+        self._gemini_caches: dict[str, tuple[str | None, float]] = {}
+        # {path: (mtime_ns, size, sha256)}; a file is re-hashed only after it changes
+        self._file_hashes: dict[Path, tuple[int, int, str]] = {}
+        self._last_tmp_prune = float("-inf")
         logger.info(f"DocumentAnalyzer initialized with root: {self.project_root}")
 
-    def analyze(self, file_path: str, question: str) -> str:
+    def _cache_key(self, file_hash: str, question: str) -> str:
+        model_id = {
+            "gemini": settings.GEMINI_MODEL_ID,
+            "deepseek": settings.DEEPSEEK_MODEL_ID,
+        }.get(self.mode, settings.LOCAL_ORCHESTRATOR_MODEL_ID)
+        digest = hashlib.sha256(f"{self.mode}:{model_id}:".encode())
+        digest.update(file_hash.encode())
+        digest.update(question.strip().encode("utf-8"))
+        return digest.hexdigest()
+
+    async def _gemini_document_cache(
+        self, file_hash: str, file_bytes: bytes, mime_type: str
+    ) -> str | None:
+        """
+        Returns a Gemini context cache holding the document, creating it if needed.
+
+        Follow-up questions about the same document then send only the question
+        instead of re-uploading and re-tokenizing the whole file. Returns None
+        when the document cannot be cached (e.g. below the model's minimum
+        cacheable size); that outcome is remembered for the cache lifetime.
+        """
+        entry = self._gemini_caches.get(file_hash)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        name = None
+        try:
+            cached = await self.client.aio.caches.create(
+                model=settings.GEMINI_MODEL_ID,
+                config=self._genai_types.CreateCachedContentConfig(
+                    contents=[
+                        self._genai_types.Content(
+                            role="user",
+                            parts=[
+                                self._genai_types.Part.from_bytes(
+                                    data=file_bytes, mime_type=mime_type
+                                )
+                            ],
+                        )
+                    ],
+                    ttl=f"{GEMINI_CONTEXT_CACHE_TTL_SECONDS}s",
+                ),
+            )
+            name = cached.name
+            logger.info(f"[DocumentAnalyzer] Created Gemini context cache {name}.")
+        except Exception as e:
+            logger.info(f"[DocumentAnalyzer] Sending document inline, cache unavailable: {e}")
+        # Expire locally a minute early so a cache is never used as it lapses
+        expires = time.monotonic() + GEMINI_CONTEXT_CACHE_TTL_SECONDS - 60
+        self._gemini_caches[file_hash] = (name, expires)
+        return name
+
+    async def _file_hash(self, path: Path) -> str:
+        stat = path.stat()
+        entry = self._file_hashes.get(path)
+        if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+        file_hash = await asyncio.to_thread(_file_sha256, path)
+        self._file_hashes[path] = (stat.st_mtime_ns, stat.st_size, file_hash)
+        return file_hash
+
+    def _load_cached(self, key: str) -> str | None:
+        try:
+            entry = json.loads((self.cache_dir / f"{key}.json").read_text("utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created", 0) > ANALYSIS_CACHE_TTL_SECONDS:
+            return None
+        return entry.get("answer")
+
+    def _store_cached(self, key: str | None, answer: str) -> None:
+        if key is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            (self.cache_dir / f"{key}.json").write_text(
+                json.dumps({"created": time.time(), "answer": answer}), "utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"[DocumentAnalyzer] Could not cache analysis: {e}")
+
+    async def analyze(self, file_path: str, question: str) -> str:
         """
         Reads a document (e.g., PDF), sends it to the Gemini multimodal endpoint
         with a specific question, and returns the model's analysis.
         """
         logger.info(
-            f"[DocumentAnalyzer] Analyzing '{file_path}' with question: '{question}'"
+            "[DocumentAnalyzer] Analyzing '{}' with question: '{}'", file_path, question
         )
         try:
+            if time.monotonic() - self._last_tmp_prune > TMP_PRUNE_INTERVAL_SECONDS:
+                self._last_tmp_prune = time.monotonic()
+                await asyncio.to_thread(
+                    _prune_tmp_dir, self.project_root / ".tmp", self.cache_dir
+                )
+            # Answers are only cached for documents inside the project
+            cache_key = None
             # Handle absolute paths by copying to .tmp folder
             if Path(file_path).is_absolute():
                 source_path = Path(file_path)
@@ -77,50 +230,72 @@ class DocumentAnalyzer:
                 tmp_dir = self.project_root / ".tmp"
                 tmp_dir.mkdir(exist_ok=True)
 
-                # Copy file to .tmp with a unique filename to avoid collisions
-                tmp_file = tmp_dir / f"{uuid.uuid4()}-{source_path.name}"
-                shutil.copy2(source_path, tmp_file)
+                # Hash in chunks; the bytes themselves are only loaded for Gemini
+                file_hash = await self._file_hash(source_path)
+                # Name the copy by content so the same document is copied once
+                tmp_file = tmp_dir / f"{file_hash}{source_path.suffix}"
+                # A real copy, not a hard link: editing the original in place
+                # must not change bytes stored under the old hash
+                try:
+                    # Touch on reuse so the age-based cleanup keeps it
+                    os.utime(tmp_file)
+                except FileNotFoundError:
+                    await asyncio.to_thread(_copy_file_atomic, source_path, tmp_file)
+                    logger.info(f"Copied external file to: {tmp_file}")
                 full_path = tmp_file
-                logger.info(f"Copied external file to: {full_path}")
             else:
                 # Handle relative paths as before
                 full_path = (self.project_root / file_path).resolve()
                 full_path.relative_to(self.project_root)  # Security check
+                if not full_path.is_file():
+                    return f"Error: File not found at '{file_path}'."
+                file_hash = await self._file_hash(full_path)
 
-            if not full_path.is_file():
-                return f"Error: File not found at '{file_path}'."
-
-            # Determine mime type dynamically
-            mime_type, _ = mimetypes.guess_type(full_path)
-            if not mime_type:
-                mime_type = (
-                    "application/octet-stream"  # Default if type can't be guessed
-                )
-
-            # Prepare the multimodal prompt
-            file_bytes = full_path.read_bytes()
+            if not Path(file_path).is_absolute():
+                cache_key = self._cache_key(file_hash, question)
+                cached = self._load_cached(cache_key)
+                if cached is not None:
+                    logger.info("[DocumentAnalyzer] Cache hit for '{}'.", file_path)
+                    return cached
 
             if self.mode == "gemini":
-                # Use the simpler format that the library expects
-                prompt_parts = [
-                    self._genai_types.Part.from_bytes(
-                        data=file_bytes, mime_type=mime_type
-                    ),
-                    (
-                        "Based on the document provided, please answer the following "
-                        f"question: {question}"
-                    ),
-                ]
-
-                # Call the model and get the response
-                response = self.client.models.generate_content(
-                    model=settings.GEMINI_MODEL_ID, contents=prompt_parts
+                question_part = (
+                    "Based on the document provided, please answer the following "
+                    f"question: {question}"
+                )
+                # Prepare the multimodal prompt
+                mime_type = _mime_type(full_path)
+                file_bytes = full_path.read_bytes()
+                cache_name = await self._gemini_document_cache(
+                    file_hash, file_bytes, mime_type
                 )
+                if cache_name:
+                    response = await self.client.aio.models.generate_content(
+                        model=settings.GEMINI_MODEL_ID,
+                        contents=[question_part],
+                        config=self._genai_types.GenerateContentConfig(
+                            cached_content=cache_name
+                        ),
+                    )
+                else:
+                    # Use the simpler format that the library expects
+                    prompt_parts = [
+                        self._genai_types.Part.from_bytes(
+                            data=file_bytes, mime_type=mime_type
+                        ),
+                        question_part,
+                    ]
+
+                    # Call the model and get the response
+                    response = await self.client.aio.models.generate_content(
+                        model=settings.GEMINI_MODEL_ID, contents=prompt_parts
+                    )
 
-                logger.success(f"Successfully received analysis for '{file_path}'.")
+                logger.success("Successfully received analysis for '{}'.", file_path)
 
                 # Check if response has text content
                 if hasattr(response, "text") and response.text:
+                    self._store_cached(cache_key, str(response.text))
                     return str(response.text)
                 elif hasattr(response, "candidates") and response.candidates:
                     # Try to get text from candidates
@@ -135,38 +310,32 @@ class DocumentAnalyzer:
                     return "No text content received from the API."
 
             # DeepSeek/local: text-only analysis
-            text_like = mime_type.startswith("text/") or full_path.suffix.lower() in {
-                ".txt",
-                ".md",
-                ".rst",
-                ".py",
-                ".json",
-                ".toml",
-                ".yaml",
-                ".yml",
-                ".ini",
-                ".cfg",
-                ".csv",
-            }
+            # Known suffixes skip the mime type lookup
+            text_like = full_path.suffix.lower() in _TEXT_EXTENSIONS or _mime_type(
+                full_path
+            ).startswith("text/")
             if not text_like:
                 return (
                     "Error: This document type requires Gemini multimodal support. "
                     "Please use a text file or switch to LLM_PROVIDER=gemini."
                 )
 
-            content = full_path.read_text(encoding="utf-8", errors="ignore")
-            if len(content) > self.max_chars:
-                content = content[: self.max_chars]
+            # Only the first max_chars characters are used, so read no further
+            with full_path.open(encoding="utf-8", errors="ignore") as f:
+                content = f.read(self.max_chars)
+            # Static document first and the question last, so provider-side
+            # prefix caching can reuse the document across questions
             prompt = (
                 "You are given a document and a question. "
                 "Answer the question using the document content.\n\n"
-                f"Question: {question}\n\n"
-                f"Document ({full_path.name}):\n{content}"
+                f"Document ({Path(file_path).name}):\n{content}\n\n"
+                f"Question: {question}"
             )
             if not self.text_agent:
                 return "Error: Text analysis agent is not initialized."
-            result = self.text_agent.run_sync(prompt)
-            logger.success(f"Successfully received analysis for '{file_path}'.")
+            result = await self.text_agent.run(prompt)
+            logger.success("Successfully received analysis for '{}'.", file_path)
+            self._store_cached(cache_key, str(result.output))
             return str(result.output)
 
         except ValueError as e:
@@ -189,7 +358,7 @@ class DocumentAnalyzer:
 def create_document_analyzer_tool(analyzer: DocumentAnalyzer) -> Tool:
     """Factory function to create the document analyzer tool."""
 
-    def analyze_document(file_path: str, question: str) -> str:
+    async def analyze_document(file_path: str, question: str) -> str:
         """
         Analyzes a document (like a PDF) to answer a specific question about its content.
         Use this tool when a user asks a question that requires understanding the content of a non-source-code file.
@@ -199,9 +368,12 @@ def create_document_analyzer_tool(analyzer: DocumentAnalyzer) -> Tool:
             question: The specific question to ask about the document's content.
         """
         try:
-            result = analyzer.analyze(file_path, question)
-            logger.debug(
-                f"[analyze_document] Result type: {type(result)}, content: {result[:100] if result else 'None'}..."
+            result = await analyzer.analyze(file_path, question)
+            # Lazy so the preview is only built when debug logging is enabled
+            logger.opt(lazy=True).debug(
+                "[analyze_document] Result type: {}, content: {}...",
+                lambda: type(result),
+                lambda: result[:100] if result else "None",
             )
             return result
         except Exception as e:
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from loguru import logger
@@ -52,7 +53,8 @@ class FileReader:
 
             # Proceed with reading as a text file
             try:
-                content = full_path.read_text(encoding="utf-8")
+                # Off the event loop, so batched reads overlap
+                content = await asyncio.to_thread(full_path.read_text, encoding="utf-8")
                 logger.info(f"[FileReader] Successfully read text from {file_path}")
                 return FileReadResult(file_path=file_path, content=content)
             except UnicodeDecodeError:
@@ -72,6 +74,11 @@ class FileReader:
             )
 
 
+    async def read_files(self, file_paths: list[str]) -> list[FileReadResult]:
+        """Reads several files concurrently, returning results in the given order."""
+        return list(await asyncio.gather(*(self.read_file(p) for p in file_paths)))
+
+
 def create_file_reader_tool(file_reader: FileReader) -> Tool:
     """Factory function to create the file reader tool."""
 
@@ -89,3 +96,25 @@ def create_file_reader_tool(file_reader: FileReader) -> Tool:
         function=read_file_content,
         description="Reads the content of text-based files. For documents like PDFs or images, use the 'analyze_document' tool instead.",
     )
+
+
+def create_file_batch_reader_tool(file_reader: FileReader) -> Tool:
+    """Factory function to create the batched file reader tool."""
+
+    async def read_files_batch(file_paths: list[str]) -> str:
+        """
+        Reads several text-based files in one call, e.g. a README, its config
+        files and the main source files. Each file's content is preceded by a
+        '=== <path> ===' header. Do not use it for binary files like PDFs or images.
+        """
+        results = await file_reader.read_files(file_paths)
+        return "\n\n".join(
+            f"=== {result.file_path} ===\n"
+            + (f"Error: {result.error_message}" if result.error_message else result.content or "")
+            for result in results
+        )
+
+    return Tool(
+        function=read_files_batch,
+        description="Reads several text-based files at once and returns each file's content under a '=== <path> ===' header. Prefer it over repeated 'read_file_content' calls when you already know which files you need.",
+    )
@@ -0,0 +1,5 @@
+import os
+
+# codebase_rag.config validates provider credentials at import time; the local
+# provider needs none, and no test talks to a model.
+os.environ.setdefault("LLM_PROVIDER", "local")
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from codebase_rag.services import llm
+from codebase_rag.services.llm import CypherGenerator, _normalize_query
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    monkeypatch.setattr(llm, "_cypher_cache", OrderedDict())
+    generator = CypherGenerator()
+    generator.questions = []
+
+    async def run(question, **kwargs):
+        generator.questions.append(question)
+        return SimpleNamespace(output="MATCH (f:Function) RETURN f.name LIMIT 5")
+
+    generator.agent = SimpleNamespace(run=run)
+    return generator
+
+
+def test_normalize_query_only_collapses_whitespace():
+    assert _normalize_query("  Find   the\tUserService  class\n") == "Find the UserService class"
+
+
+@pytest.mark.asyncio
+async def test_repeated_question_is_translated_once(generator):
+    first = await generator.generate("Find all functions")
+    second = await generator.generate("  Find  all\tfunctions ")
+
+    assert first == second
+    assert generator.questions == ["Find all functions"]
+
+
+@pytest.mark.asyncio
+async def test_questions_differing_in_case_are_translated_separately(generator):
+    await generator.generate("Find the UserService class")
+    await generator.generate("find the userservice class")
+
+    assert len(generator.questions) == 2
+
+
+@pytest.mark.asyncio
+async def test_translations_expire(generator, monkeypatch):
+    monkeypatch.setattr(llm, "CYPHER_CACHE_TTL_SECONDS", -1)
+
+    await generator.generate("Find all functions")
+    await generator.generate("Find all functions")
+
+    assert len(generator.questions) == 2
@@ -0,0 +1,83 @@
+import pytest
+
+from codebase_rag.services.llm import (
+    DEFAULT_QUERY_LIMIT,
+    MAX_PATH_HOPS,
+    _clean_cypher_response,
+    _ensure_limit,
+    _rewrite_cypher,
+)
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("MATCH (a)-[*]->(b) RETURN b.name", f"[*1..{MAX_PATH_HOPS}]"),
+        ("MATCH (a)-[:CALLS*]->(b) RETURN b.name", f"[:CALLS*1..{MAX_PATH_HOPS}]"),
+        ("MATCH (a)-[:CALLS*2..]->(b) RETURN b.name", f"[:CALLS*2..{MAX_PATH_HOPS}]"),
+        ("MATCH (a)-[*..]->(b) RETURN b.name", f"[*1..{MAX_PATH_HOPS}]"),
+        # A lower bound above the cap is kept as an exact hop count
+        ("MATCH (a)-[*9..]->(b) RETURN b.name", "[*9..9]"),
+    ],
+)
+def test_unbounded_paths_get_an_upper_bound(query, expected):
+    assert expected in _rewrite_cypher(query)
+
+
+@pytest.mark.parametrize(
+    "pattern", ["[*3]", "[:CALLS*1..2]", "[*2..3]", "[:CALLS]"]
+)
+def test_bounded_paths_are_unchanged(pattern):
+    query = f"MATCH (a)-{pattern}->(b) RETURN b.name LIMIT 5"
+    assert _rewrite_cypher(query) == query
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "MATCH (f:Function) RETURN f",
+        # Later clauses that refer to the returned variable keep working
+        "MATCH (f:Function) RETURN f ORDER BY f.start_line",
+        "MATCH (f:Function) WITH f ORDER BY f.name RETURN f",
+    ],
+)
+def test_whole_nodes_are_returned_unchanged(query):
+    assert _rewrite_cypher(query) == f"{query} LIMIT {DEFAULT_QUERY_LIMIT};"
+
+
+def test_string_literals_are_not_rewritten():
+    query = "MATCH (f) WHERE f.name = '[*]' RETURN f.name"
+    assert _rewrite_cypher(query) == f"{query} LIMIT {DEFAULT_QUERY_LIMIT};"
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("MATCH (f) RETURN f.name", f"MATCH (f) RETURN f.name LIMIT {DEFAULT_QUERY_LIMIT};"),
+        ("MATCH (f) RETURN f.name;", f"MATCH (f) RETURN f.name LIMIT {DEFAULT_QUERY_LIMIT};"),
+        ("MATCH (f) RETURN f.name LIMIT 5", "MATCH (f) RETURN f.name LIMIT 5"),
+        ("MATCH (f) RETURN f.name SKIP $s LIMIT $l;", "MATCH (f) RETURN f.name SKIP $s LIMIT $l;"),
+        # LIMIT only inside a literal, a comment or a subquery does not count
+        (
+            "MATCH (f) WHERE f.name = 'limit 5' RETURN f.name",
+            f"MATCH (f) WHERE f.name = 'limit 5' RETURN f.name LIMIT {DEFAULT_QUERY_LIMIT};",
+        ),
+        ("MATCH (f) RETURN f.name // LIMIT 3", f"MATCH (f) RETURN f.name LIMIT {DEFAULT_QUERY_LIMIT};"),
+        (
+            "CALL { MATCH (f) RETURN f LIMIT 1 } RETURN f.name",
+            f"CALL {{ MATCH (f) RETURN f LIMIT 1 }} RETURN f.name LIMIT {DEFAULT_QUERY_LIMIT};",
+        ),
+    ],
+)
+def test_ensure_limit(query, expected):
+    assert _ensure_limit(query) == expected
+
+
+def test_clean_cypher_response_strips_fences_and_comments():
+    response = "```cypher\nMATCH (f) RETURN f.name // all of them\n```"
+    assert _clean_cypher_response(response) == "MATCH (f) RETURN f.name;"
+
+
+def test_clean_cypher_response_keeps_urls_in_literals():
+    response = "MATCH (f) WHERE f.url = 'http://x' RETURN f"
+    assert _clean_cypher_response(response) == f"{response};"
@@ -0,0 +1,83 @@
+import pytest
+
+from codebase_rag.tools import directory_lister
+from codebase_rag.tools.directory_lister import DirectoryLister
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for rel in ("README.md", "pkg/__init__.py", "pkg/core/model.py", "docs/guide.md"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    for ignored in (".git/HEAD", "pkg/__pycache__/model.cpython-312.pyc", ".tmp/doc_cache/a.json"):
+        path = tmp_path / ignored
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return tmp_path
+
+
+def test_lists_files_relative_to_root_sorted(repo):
+    listing = DirectoryLister(str(repo)).list_repo_files()
+
+    assert listing.splitlines() == [
+        "README.md",
+        "docs/guide.md",
+        "pkg/__init__.py",
+        "pkg/core/model.py",
+    ]
+
+
+def test_lists_a_subdirectory(repo):
+    listing = DirectoryLister(str(repo)).list_repo_files("pkg")
+
+    assert listing.splitlines() == ["pkg/__init__.py", "pkg/core/model.py"]
+
+
+def test_does_not_follow_directory_symlinks(repo, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "secret.txt").write_text("x")
+    (repo / "link").symlink_to(outside, target_is_directory=True)
+
+    assert "secret" not in DirectoryLister(str(repo)).list_repo_files()
+
+
+def test_stops_at_the_file_cap_with_the_first_sorted_files(repo, monkeypatch):
+    monkeypatch.setattr(directory_lister, "MAX_LISTED_FILES", 2)
+
+    lines = DirectoryLister(str(repo)).list_repo_files().splitlines()
+
+    assert lines[:2] == ["README.md", "docs/guide.md"]
+    assert lines[2].startswith("... (stopped after 2 files")
+
+
+def test_exactly_the_cap_is_not_truncated(repo, monkeypatch):
+    monkeypatch.setattr(directory_lister, "MAX_LISTED_FILES", 4)
+
+    lines = DirectoryLister(str(repo)).list_repo_files().splitlines()
+
+    assert len(lines) == 4
+    assert not lines[-1].startswith("...")
+
+
+def test_files_sort_before_a_sibling_directory_sharing_their_prefix(tmp_path):
+    for rel in ("a/z.py", "a.txt", "a-b.txt"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+    listing = DirectoryLister(str(tmp_path)).list_repo_files()
+
+    assert listing.splitlines() == sorted(["a/z.py", "a.txt", "a-b.txt"])
+
+
+def test_rejects_paths_outside_the_root(repo):
+    assert DirectoryLister(str(repo)).list_repo_files("..").startswith("Error: Access denied")
+
+
+def test_reports_missing_and_empty_directories(repo):
+    lister = DirectoryLister(str(repo))
+    (repo / "empty").mkdir()
+
+    assert lister.list_repo_files("missing").startswith("Error:")
+    assert lister.list_repo_files("empty") == "No files found under 'empty'."
@@ -0,0 +1,110 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from codebase_rag.tools import document_analyzer
+from codebase_rag.tools.document_analyzer import DocumentAnalyzer
+
+
+class FakeTextAgent:
+    def __init__(self):
+        self.prompts = []
+
+    async def run(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(output=f"answer {len(self.prompts)}")
+
+
+@pytest.fixture
+def analyzer(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_analyzer.settings, "LLM_PROVIDER", "local")
+    analyzer = DocumentAnalyzer(str(tmp_path / "repo"))
+    analyzer.project_root.mkdir()
+    analyzer.text_agent = FakeTextAgent()
+    return analyzer
+
+
+@pytest.mark.asyncio
+async def test_repeated_question_is_answered_from_cache(analyzer):
+    (analyzer.project_root / "notes.md").write_text("some notes")
+
+    first = await analyzer.analyze("notes.md", "What is this?")
+    second = await analyzer.analyze("notes.md", "  What is this?  ")
+
+    assert first == second == "answer 1"
+    assert len(analyzer.text_agent.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_misses_on_new_question_or_changed_file(analyzer):
+    notes = analyzer.project_root / "notes.md"
+    notes.write_text("some notes")
+
+    await analyzer.analyze("notes.md", "What is this?")
+    assert await analyzer.analyze("notes.md", "Who wrote it?") == "answer 2"
+
+    notes.write_text("other notes")
+    assert await analyzer.analyze("notes.md", "What is this?") == "answer 3"
+
+
+@pytest.mark.asyncio
+async def test_expired_answers_are_not_reused(analyzer, monkeypatch):
+    (analyzer.project_root / "notes.md").write_text("some notes")
+    await analyzer.analyze("notes.md", "What is this?")
+    monkeypatch.setattr(document_analyzer, "ANALYSIS_CACHE_TTL_SECONDS", -1)
+
+    assert await analyzer.analyze("notes.md", "What is this?") == "answer 2"
+
+
+@pytest.mark.asyncio
+async def test_external_file_is_copied_not_linked(analyzer, tmp_path):
+    external = tmp_path / "paper.txt"
+    external.write_text("first version")
+
+    await analyzer.analyze(str(external), "Summarize")
+    (copy,) = (analyzer.project_root / ".tmp").glob("*.txt")
+    assert not os.path.samefile(copy, external)
+
+    # Editing the original in place leaves the content-addressed copy intact
+    with external.open("r+") as f:
+        f.write("FIRST")
+    assert copy.read_text() == "first version"
+
+
+@pytest.mark.asyncio
+async def test_same_document_is_copied_once(analyzer, tmp_path):
+    external = tmp_path / "paper.txt"
+    external.write_text("first version")
+
+    await analyzer.analyze(str(external), "Summarize")
+    await analyzer.analyze(str(external), "List the authors")
+    assert len(list((analyzer.project_root / ".tmp").glob("*.txt"))) == 1
+
+    # New content gets a new content-addressed copy
+    external.write_text("FIRST version")
+    await analyzer.analyze(str(external), "Summarize")
+    assert len(list((analyzer.project_root / ".tmp").glob("*.txt"))) == 2
+    assert "FIRST version" in analyzer.text_agent.prompts[-1]
+
+
+@pytest.mark.asyncio
+async def test_old_tmp_files_are_pruned(analyzer):
+    tmp_dir = analyzer.project_root / ".tmp"
+    analyzer.cache_dir.mkdir(parents=True)
+    stale_copy = tmp_dir / "stale.pdf"
+    stale_answer = analyzer.cache_dir / "stale.json"
+    fresh_copy = tmp_dir / "fresh.pdf"
+    for path in (stale_copy, stale_answer, fresh_copy):
+        path.write_text("x")
+    long_ago = time.time() - document_analyzer.ANALYSIS_CACHE_TTL_SECONDS - 60
+    os.utime(stale_copy, (long_ago, long_ago))
+    os.utime(stale_answer, (long_ago, long_ago))
+    (analyzer.project_root / "notes.md").write_text("some notes")
+
+    await analyzer.analyze("notes.md", "What is this?")
+
+    assert not stale_copy.exists()
+    assert not stale_answer.exists()
+    assert fresh_copy.exists()
@@ -0,0 +1,50 @@
+import pytest
+
+from codebase_rag.tools.codebase_query import _parameterize_cypher
+
+
+def test_literals_become_parameters():
+    query = "MATCH (f {name: 'foo'}) WHERE f.path = \"a/b.py\" RETURN f.name"
+
+    assert _parameterize_cypher(query) == (
+        "MATCH (f {name: $p0}) WHERE f.path = $p1 RETURN f.name",
+        {"p0": "foo", "p1": "a/b.py"},
+    )
+
+
+def test_questions_differing_in_names_share_query_text():
+    first, first_params = _parameterize_cypher("MATCH (c:Class {name: 'UserService'}) RETURN c.path")
+    second, second_params = _parameterize_cypher("MATCH (c:Class {name: 'OrderService'}) RETURN c.path")
+
+    assert first == second
+    assert first_params != second_params
+
+
+@pytest.mark.parametrize(
+    ("literal", "value"),
+    [
+        (r"'it\'s'", "it's"),
+        (r'"say \"hi\""', 'say "hi"'),
+        (r"'a\\b'", "a\\b"),
+        (r"'line\nbreak'", "line\nbreak"),
+        ("''", ""),
+        ("'contains \"double\" quotes'", 'contains "double" quotes'),
+    ],
+)
+def test_escapes_are_decoded(literal, value):
+    query, params = _parameterize_cypher(f"MATCH (f) WHERE f.name = {literal} RETURN f")
+
+    assert query == "MATCH (f) WHERE f.name = $p0 RETURN f"
+    assert params == {"p0": value}
+
+
+def test_uncommon_escapes_are_left_inline():
+    query = r"MATCH (f) WHERE f.name = 'caf\u00e9' RETURN f"
+
+    assert _parameterize_cypher(query) == (query, {})
+
+
+def test_query_without_literals_is_unchanged():
+    query = "MATCH (f:Function) RETURN f.name LIMIT 50;"
+
+    assert _parameterize_cypher(query) == (query, {})
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from codebase_rag.services.llm import LLMGenerationError
+from codebase_rag.tools.codebase_query import _query_graph_batch, _unwind_batch
+
+LOOKUP = "MATCH (c:Class {name: '%s'}) RETURN c.path, c.name AS name LIMIT 5;"
+
+
+class FakeGenerator:
+    async def generate(self, question):
+        if question == "nonsense":
+            raise LLMGenerationError("no query")
+        if question == "count":
+            return "MATCH (c:Class) RETURN count(c) LIMIT 5;"
+        return LOOKUP % question
+
+
+class FakeIngestor:
+    def __init__(self, rows=None, fail_batch=False):
+        self.queries = []
+        self.rows = rows or []
+        self.fail_batch = fail_batch
+
+    async def fetch_all_async(self, query, params=None):
+        self.queries.append((query, params))
+        if query.startswith("UNWIND"):
+            if self.fail_batch:
+                raise RuntimeError("subqueries not supported")
+            return [dict(row) for row in self.rows]
+        return [{"single": params}]
+
+
+def test_unwind_batch_folds_a_lookup():
+    query = "MATCH (c:Class {name: $p0}) RETURN c.path, c.name AS name ORDER BY c.path LIMIT 5;"
+
+    batched, params = _unwind_batch(query, [{"p0": "A"}, {"p0": "B"}])
+
+    assert batched == (
+        "UNWIND range(0, size($batch) - 1) AS batch_index CALL { WITH batch_index "
+        "MATCH (c:Class {name: $batch[batch_index].p0}) "
+        "RETURN c.path AS `c.path`, c.name AS `name` ORDER BY c.path LIMIT 5 } "
+        "RETURN batch_index, `c.path`, `name`;"
+    )
+    assert params == {"batch": [{"p0": "A"}, {"p0": "B"}]}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "MATCH (c:Class {name: $p0}) RETURN count(c)",
+        "MATCH (c:Class {name: $p0}) RETURN DISTINCT c.path",
+        "MATCH (c:Class {name: $p0}) RETURN c.path UNION MATCH (f:File) RETURN f.path",
+        "MATCH (c:Class {name: $p0}) RETURN *",
+        r"MATCH (c:Class {name: $p0}) WHERE c.doc = 'café' RETURN c.path",
+    ],
+)
+def test_unwind_batch_skips_other_queries(query):
+    assert _unwind_batch(query, [{"p0": "A"}, {"p0": "B"}]) is None
+
+
+def test_same_shape_lookups_run_as_one_query():
+    ingestor = FakeIngestor(
+        rows=[
+            {"batch_index": 1, "c.path": "b.py", "name": "B"},
+            {"batch_index": 0, "c.path": "a.py", "name": "A"},
+        ]
+    )
+
+    answers = asyncio.run(
+        _query_graph_batch(ingestor, FakeGenerator(), ["A", "B", "C"])
+    )
+
+    assert len(ingestor.queries) == 1
+    assert [answer.results for answer in answers] == [
+        [{"c.path": "a.py", "name": "A"}],
+        [{"c.path": "b.py", "name": "B"}],
+        [],
+    ]
+    assert answers[0].query_used == LOOKUP % "A"
+
+
+def test_failed_batch_falls_back_to_single_queries():
+    ingestor = FakeIngestor(fail_batch=True)
+
+    answers = asyncio.run(_query_graph_batch(ingestor, FakeGenerator(), ["A", "B"]))
+
+    assert len(ingestor.queries) == 3
+    assert [answer.results for answer in answers] == [
+        [{"single": {"p0": "A"}}],
+        [{"single": {"p0": "B"}}],
+    ]
+
+
+def test_mixed_questions_keep_their_order():
+    ingestor = FakeIngestor()
+
+    answers = asyncio.run(
+        _query_graph_batch(ingestor, FakeGenerator(), ["count", "nonsense", "A"])
+    )
+
+    assert [query for query, _ in ingestor.queries] == [
+        "MATCH (c:Class) RETURN count(c) LIMIT 5;",
+        "MATCH (c:Class {name: $p0}) RETURN c.path, c.name AS name LIMIT 5;",
+    ]
+    assert answers[0].query_used == "MATCH (c:Class) RETURN count(c) LIMIT 5;"
+    assert answers[1].query_used == "N/A"
+    assert answers[2].results == [{"single": {"p0": "A"}}]
@@ -0,0 +1,77 @@
+import pytest
+
+from codebase_rag.services import graph_service
+from codebase_rag.services.graph_service import MemgraphIngestor
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+
+    def execute(self, query, params):
+        self.conn.queries.append(query)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.autocommit = False
+        self.closed = False
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def connect(host, port):
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(graph_service.mgclient, "connect", connect)
+    return opened
+
+
+def test_uncontended_reads_use_the_main_connection(connections):
+    with MemgraphIngestor("localhost", 7687) as ingestor:
+        ingestor._fetch_pooled("MATCH (n) RETURN n.name", None)
+        ingestor._fetch_pooled("MATCH (n) RETURN n.path", None)
+
+    assert len(connections) == 1
+    assert len(connections[0].queries) == 2
+
+
+def test_busy_main_connection_borrows_from_the_pool(connections):
+    with MemgraphIngestor("localhost", 7687) as ingestor:
+        with ingestor._conn_lock:
+            ingestor._fetch_pooled("MATCH (n) RETURN n.name", None)
+            ingestor._fetch_pooled("MATCH (n) RETURN n.path", None)
+
+    main, pooled = connections
+    assert not main.queries
+    assert len(pooled.queries) == 2
+    assert main.closed and pooled.closed
+
+
+def test_connections_returned_after_exit_are_closed(connections):
+    ingestor = MemgraphIngestor("localhost", 7687).__enter__()
+    conn, generation = ingestor._acquire_read_connection()
+
+    ingestor.__exit__(None, None, None)
+    assert not conn.closed
+    ingestor._release_read_connection(conn, generation)
+
+    assert conn.closed
+    assert ingestor._read_pool.empty()
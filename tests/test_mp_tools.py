@@ -0,0 +1,240 @@
+import itertools
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from pymatgen.core import Lattice, Structure
+
+from agentom.settings import settings
+from agentom.tools import mp_tools
+
+
+ENTRIES = [
+    {"mpid": "mp-1", "formula": "Fe", "crystal_system": "cubic", "num_sites": 1},
+    {"mpid": "mp-2", "formula": "NaCl", "crystal_system": "cubic", "num_sites": 2},
+    {"mpid": "mp-3", "formula": "TiO2", "crystal_system": "tetragonal", "num_sites": 6},
+    {"mpid": "mp-4", "formula": "CsCl", "crystal_system": "cubic", "num_sites": 2},
+]
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Point the default workspace at tmp_path and return its WORKSPACE_DIR."""
+    monkeypatch.setattr(settings._settings, "WORKSPACE_ROOT", tmp_path)
+    monkeypatch.setattr(settings._settings, "_current_session", None)
+    # Drop a WORKSPACE_DIR override that other tests set on the wrapper itself
+    monkeypatch.delitem(vars(settings), "WORKSPACE_DIR", raising=False)
+    settings.ensure_directories()
+    return settings.WORKSPACE_DIR
+
+
+def _doc(mpid="mp-22862", formula="NaCl", structure=None):
+    """A stand-in for an MP SummaryDoc with the fields _doc_to_entry reads."""
+    return SimpleNamespace(
+        material_id=mpid, formula_pretty=formula, energy_above_hull=0.0, is_stable=True,
+        symmetry=SimpleNamespace(crystal_system="Cubic", symbol="Fm-3m"), nelements=2, nsites=2,
+        structure=structure,
+    )
+
+
+def _rock_salt():
+    return Structure(Lattice.cubic(5.64), ["Na", "Cl"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+
+
+def test_save_docs_splits_index_and_structures(workspace):
+    structure = _rock_salt()
+
+    docs_info = mp_tools._save_docs_to_json([_doc(structure=structure)], "NaCl.json")
+
+    entries = mp_tools._read_json(workspace / docs_info["relative_path"])
+    assert docs_info["num_results"] == 1
+    assert "structure" not in entries[0]
+    assert entries[0]["structure_ref"].startswith("tmp/NaCl_structures/mp-22862")
+    assert Structure.from_dict(mp_tools._load_entry_structure(entries[0])) == structure
+
+
+def test_save_docs_drops_structures_of_the_previous_result(workspace):
+    mp_tools._save_docs_to_json([_doc(structure=_rock_salt())], "NaCl.json")
+
+    mp_tools._save_docs_to_json([_doc("mp-1", structure=_rock_salt())], "NaCl.json")
+
+    structures_dir = settings.TEMP_DIR / "NaCl_structures"
+    assert [p.name.split(".")[0] for p in structures_dir.iterdir()] == ["mp-1"]
+
+
+def test_load_entry_structure_reads_inline_structures():
+    structure_dict = _rock_salt().as_dict()
+
+    assert mp_tools._load_entry_structure({"structure": structure_dict}) is structure_dict
+    assert mp_tools._load_entry_structure({"mpid": "mp-1"}) is None
+
+
+def _write_result(workspace: Path, name: str) -> dict:
+    path = settings.TEMP_DIR / name
+    mp_tools._write_json(path, ENTRIES)
+    return {"num_results": len(ENTRIES), "relative_path": path.relative_to(workspace)}
+
+
+def test_search_cache_hit(workspace):
+    cache_file = settings.TEMP_DIR / "mp_cache" / "index.json"
+    docs_info = _write_result(workspace, "a.json")
+    mp_tools._put_cached_docs_info(cache_file, "k", docs_info)
+
+    assert mp_tools._get_cached_docs_info(cache_file, "k") == docs_info
+    assert mp_tools._get_cached_docs_info(cache_file, "other") is None
+
+
+def test_search_cache_expires(workspace, monkeypatch):
+    cache_file = settings.TEMP_DIR / "mp_cache" / "index.json"
+    mp_tools._put_cached_docs_info(cache_file, "k", _write_result(workspace, "a.json"))
+    monkeypatch.setattr(mp_tools, "MP_CACHE_MAX_AGE", -1)
+
+    assert mp_tools._get_cached_docs_info(cache_file, "k") is None
+
+
+def test_search_cache_rejects_rewritten_result(workspace):
+    cache_file = settings.TEMP_DIR / "mp_cache" / "index.json"
+    docs_info = _write_result(workspace, "a.json")
+    mp_tools._put_cached_docs_info(cache_file, "k", docs_info)
+    result_path = workspace / docs_info["relative_path"]
+    stat = result_path.stat()
+    os.utime(result_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert mp_tools._get_cached_docs_info(cache_file, "k") is None
+
+
+def test_search_cache_evicts_oldest(workspace, monkeypatch):
+    cache_file = settings.TEMP_DIR / "mp_cache" / "index.json"
+    docs_info = _write_result(workspace, "a.json")
+    monkeypatch.setattr(mp_tools, "MP_CACHE_MAX_ENTRIES", 2)
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(mp_tools.time, "time", lambda: next(clock))
+
+    for key in ("k1", "k2", "k3"):
+        mp_tools._put_cached_docs_info(cache_file, key, docs_info)
+
+    assert set(mp_tools._read_json(cache_file)) == {"k2", "k3"}
+
+
+def test_search_and_save_reuses_cached_result(workspace, monkeypatch):
+    calls = []
+
+    def search(**kwargs):
+        calls.append(kwargs)
+        return [_doc()]
+
+    mpr = SimpleNamespace(materials=SimpleNamespace(summary=SimpleNamespace(search=search)))
+    monkeypatch.setattr(mp_tools, "_get_mpr", lambda: mpr)
+
+    first = mp_tools._search_and_save("NaCl.json", fetch_structure=False, formula="NaCl")
+    second = mp_tools._search_and_save("NaCl.json", fetch_structure=False, formula="NaCl")
+
+    assert len(calls) == 1
+    assert first == second
+    assert mp_tools._read_json(workspace / first["relative_path"])[0]["mpid"] == "mp-22862"
+
+
+def test_compile_filters():
+    assert mp_tools._compile_filters({})(ENTRIES[0])
+
+    cubic_pairs = mp_tools._compile_filters({"crystal_system": "cubic", "num_sites": 2})
+    assert [e["mpid"] for e in ENTRIES if cubic_pairs(e)] == ["mp-2", "mp-4"]
+
+    single = mp_tools._compile_filters({"formula": "TiO2"})
+    assert [e["mpid"] for e in ENTRIES if single(e)] == ["mp-3"]
+
+    # Entries without a filtered field never match
+    assert not mp_tools._compile_filters({"e_hull": 0.0})(ENTRIES[0])
+
+
+def test_write_json_entries_is_plain_json_with_offsets(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+
+    assert json.loads(path.read_bytes()) == ENTRIES
+    offsets = mp_tools._read_entry_offsets(path)
+    assert offsets is not None
+    assert len(offsets) == len(ENTRIES) + 1
+    assert int(offsets[-1]) == path.stat().st_size
+
+
+def test_read_entries_at_returns_requested_entries(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+    offsets = mp_tools._read_entry_offsets(path)
+
+    assert mp_tools._read_entries_at(path, offsets, [3, 0, 2]) == [ENTRIES[3], ENTRIES[0], ENTRIES[2]]
+
+
+def test_write_json_entries_empty(tmp_path):
+    path = tmp_path / "empty.json"
+    mp_tools._write_json_entries(path, [])
+
+    assert json.loads(path.read_bytes()) == []
+    offsets = mp_tools._read_entry_offsets(path)
+    assert offsets is not None and len(offsets) == 1
+
+
+def test_stale_offsets_are_ignored(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+    # Rewritten without a side-car, so the old offsets no longer match
+    mp_tools._write_json(path, ENTRIES[:2])
+
+    assert mp_tools._read_entry_offsets(path) is None
+
+
+def test_missing_offsets(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json(path, ENTRIES)
+
+    assert mp_tools._read_entry_offsets(path) is None
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    structure = {"lattice": {"matrix": [[1.0, 0, 0], [0, 1.0, 0], [0, 0, 1.0]]}, "sites": []}
+    path = tmp_path / "mp-1.json.zst"
+    mp_tools._write_json(path, structure)
+
+    assert path.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"  # zstd frame magic
+    assert mp_tools._read_json(path) == structure
+
+
+def test_indexed_matches_agrees_with_scan(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+
+    for filters in ({"crystal_system": "cubic"}, {"crystal_system": "cubic", "num_sites": 2}, {"formula": "TiO2"}):
+        matches = mp_tools._compile_filters(filters)
+        assert mp_tools._indexed_matches(path, filters) == [e for e in ENTRIES if matches(e)]
+
+    assert mp_tools._indexed_matches(path, {"formula": "Au"}) == []
+
+
+def test_indexed_matches_without_offsets(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json(path, ENTRIES)
+
+    assert mp_tools._indexed_matches(path, {"num_sites": 2}) == [ENTRIES[1], ENTRIES[3]]
+
+
+def test_indexed_matches_falls_back(tmp_path):
+    path = tmp_path / "entries.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+
+    assert mp_tools._indexed_matches(path, {}) is None
+    assert mp_tools._indexed_matches(path, {"structure_ref": "x"}) is None
+    assert mp_tools._indexed_matches(path, {"formula": ["Fe"]}) is None
+
+
+def test_sample_data_from_json(workspace):
+    path = settings.TEMP_DIR / "data.json"
+    mp_tools._write_json_entries(path, ENTRIES)
+
+    result = mp_tools.sample_data_from_json("tmp/data.json", crystal_system="cubic", num_sites=2)
+
+    assert result.startswith("Sampled 2 materials")
+    assert json.loads((settings.TEMP_DIR / "sampled_data.json").read_bytes()) == [ENTRIES[1], ENTRIES[3]]
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from agentom import response_cache
+from agentom.response_cache import ResponseCachePlugin, _request_key
+from agentom.settings import settings
+
+
+@pytest.fixture
+def cache_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings._settings, "WORKSPACE_ROOT", tmp_path)
+    monkeypatch.setattr(settings._settings, "RESPONSE_CACHE_ENABLED", True)
+    return tmp_path / ".agent_cache"
+
+
+def _request(text="hello", call_id=None):
+    parts = [types.Part(text=text)]
+    if call_id is not None:
+        parts.append(types.Part(function_call=types.FunctionCall(id=call_id, name="list_files", args={})))
+    return LlmRequest(model="test-model", contents=[types.Content(role="user", parts=parts)])
+
+
+def _response(text="hi there", **kwargs):
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]), **kwargs)
+
+
+def _context(invocation_id="inv-1", agent_name="agent"):
+    return SimpleNamespace(invocation_id=invocation_id, agent_name=agent_name)
+
+
+def _model_round_trip(plugin, request, response, context=None):
+    """Run before/after_model_callback as ADK does; returns the cached response or None."""
+    context = context or _context()
+
+    async def run():
+        cached = await plugin.before_model_callback(callback_context=context, llm_request=request)
+        if cached is None:
+            await plugin.after_model_callback(callback_context=context, llm_response=response)
+        return cached
+
+    return asyncio.run(run())
+
+
+def test_request_key_ignores_function_call_ids():
+    assert _request_key(_request(call_id="a")) == _request_key(_request(call_id="b"))
+    assert _request_key(_request("hello")) != _request_key(_request("goodbye"))
+
+
+def test_disabled_cache_is_a_no_op(cache_root, monkeypatch):
+    monkeypatch.setattr(settings._settings, "RESPONSE_CACHE_ENABLED", False)
+    plugin = ResponseCachePlugin()
+
+    assert _model_round_trip(plugin, _request(), _response()) is None
+    assert _model_round_trip(plugin, _request(), _response()) is None
+    assert not cache_root.exists()
+
+
+def test_second_identical_request_is_served_from_cache(cache_root):
+    plugin = ResponseCachePlugin()
+
+    assert _model_round_trip(plugin, _request(), _response("first")) is None
+    cached = _model_round_trip(plugin, _request(), _response("second"))
+
+    assert cached.content.parts[0].text == "first"
+    assert not plugin._pending
+
+
+def test_cached_response_survives_a_new_plugin(cache_root):
+    _model_round_trip(ResponseCachePlugin(), _request(), _response("first"))
+
+    cached = _model_round_trip(ResponseCachePlugin(), _request(), _response("second"))
+
+    assert cached.content.parts[0].text == "first"
+
+
+def test_partial_and_failed_responses_are_not_cached(cache_root):
+    plugin = ResponseCachePlugin()
+    context = _context()
+
+    async def run():
+        await plugin.before_model_callback(callback_context=context, llm_request=_request())
+        await plugin.after_model_callback(callback_context=context, llm_response=_response(partial=True))
+        await plugin.after_model_callback(callback_context=context, llm_response=_response(error_code="500"))
+
+    asyncio.run(run())
+
+    assert plugin._get(_request_key(_request())) is None
+
+
+def test_expired_disk_entries_are_dropped(cache_root, monkeypatch):
+    _model_round_trip(ResponseCachePlugin(), _request(), _response())
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_TTL_SECONDS", -1)
+
+    assert ResponseCachePlugin()._get(_request_key(_request())) is None
+    assert not list(cache_root.glob("*.json"))
+
+
+def test_prune_keeps_the_newest_disk_entries(cache_root, monkeypatch):
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_MAX_DISK_ENTRIES", 2)
+    plugin = ResponseCachePlugin()
+    start = time.time() - 60
+    for i, text in enumerate(["a", "b", "c"]):
+        key = _request_key(_request(text))
+        plugin._put(key, _response())
+        os.utime(cache_root / f"{key}.json", (start + i, start + i))
+
+    plugin._prune_disk()
+
+    remaining = {path.stem for path in cache_root.glob("*.json")}
+    assert remaining == {_request_key(_request("b")), _request_key(_request("c"))}
+
+
+def test_memory_entries_are_bounded(cache_root):
+    plugin = ResponseCachePlugin(max_entries=2)
+    for text in ["a", "b", "c"]:
+        plugin._put(_request_key(_request(text)), _response())
+
+    assert list(plugin._memory) == [_request_key(_request("b")), _request_key(_request("c"))]
+
+
+def test_pending_keys_are_cleared(cache_root):
+    plugin = ResponseCachePlugin()
+
+    async def run():
+        await plugin.before_model_callback(callback_context=_context("inv-1", "a"), llm_request=_request("x"))
+        await plugin.before_model_callback(callback_context=_context("inv-1", "b"), llm_request=_request("y"))
+        await plugin.before_model_callback(callback_context=_context("inv-2", "a"), llm_request=_request("z"))
+        await plugin.on_model_error_callback(
+            callback_context=_context("inv-2", "a"), llm_request=_request("z"), error=RuntimeError()
+        )
+        await plugin.after_run_callback(invocation_context=SimpleNamespace(invocation_id="inv-1"))
+
+    asyncio.run(run())
+
+    assert not plugin._pending
@@ -0,0 +1,25 @@
+import pytest
+
+from agentom.tools import common_tools as ct
+
+
+def test_safe_path_rejects_symlink_escape(tmp_path, monkeypatch):
+    workspace = tmp_path / "workspace"
+    outside = tmp_path / "outside"
+    workspace.mkdir()
+    outside.mkdir()
+    (outside / "secret.txt").write_text("secret")
+    (workspace / "out").symlink_to(outside, target_is_directory=True)
+
+    monkeypatch.setattr(ct.settings, "WORKSPACE_DIR", workspace)
+
+    with pytest.raises(ValueError):
+        ct.safe_path("out/secret.txt")
+    assert ct.read_file("out/secret.txt").startswith("Error")
+    assert ct.write_file("out/new.txt", "x").startswith("Error")
+    assert not (outside / "new.txt").exists()
+
+
+def test_safe_path_allows_plain_relative_paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(ct.settings, "WORKSPACE_DIR", tmp_path)
+    assert ct.safe_path("inputs/a.cif") == tmp_path / "inputs" / "a.cif"
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from ase import Atoms
+from ase.data import covalent_radii
+from ase.geometry import get_distances
+from ase.io import write
+
+from agentom.settings import settings
+from agentom.tools import structure_tools
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings._settings, "WORKSPACE_ROOT", tmp_path)
+    monkeypatch.setattr(settings._settings, "_current_session", None)
+    # Drop a WORKSPACE_DIR override that other tests set on the wrapper itself
+    monkeypatch.delitem(vars(settings), "WORKSPACE_DIR", raising=False)
+    settings.ensure_directories()
+    return settings.WORKSPACE_DIR
+
+
+def _brute_force_close_pairs(atoms, tolerance):
+    """The all-pairs minimum-image check that check_close_atoms used to run."""
+    distances, _ = get_distances(atoms.positions, cell=atoms.cell, pbc=atoms.pbc)
+    pairs = []
+    for i in range(len(atoms)):
+        for j in range(i + 1, len(atoms)):
+            dist = float(np.linalg.norm(distances[i, j]))
+            radii = covalent_radii[atoms[i].number] + covalent_radii[atoms[j].number]
+            min_dist = radii + tolerance
+            if dist < min_dist:
+                pairs.append((i, j, round(dist, 3), round(float(min_dist), 3)))
+    return pairs
+
+
+def _close_pairs(workspace, atoms, tolerance):
+    write(workspace / "cell.xyz", atoms, format="extxyz")
+    result = structure_tools.check_close_atoms(".", "cell.xyz", tolerance=tolerance)
+    assert result["number_of_detected_close_pairs"] == len(result["close_pairs"])
+    return [
+        (pair["atom1"]["index"], pair["atom2"]["index"],
+         pair["distance_angstrom"], pair["min_distance_angstrom"])
+        for pair in result["close_pairs"]
+    ]
+
+
+def test_close_pair_across_the_periodic_boundary(workspace):
+    # O-H are 0.8 A apart only through the x boundary; Fe sits far from both
+    atoms = Atoms(
+        "OHFe", positions=[[0.3, 2, 2], [4.5, 2, 2], [2.5, 0.5, 4]], cell=[5, 5, 5], pbc=True
+    )
+
+    assert _close_pairs(workspace, atoms, -0.1) == [(0, 1, 0.8, 0.87)]
+    assert _close_pairs(workspace, atoms, -0.5) == []
+    # Without periodicity the same atoms are 4.2 A apart
+    atoms.pbc = False
+    assert _close_pairs(workspace, atoms, -0.1) == []
+
+
+@pytest.mark.parametrize("tolerance", [-0.5, -0.2, 0.0, 0.4])
+def test_matches_the_brute_force_check(workspace, tolerance):
+    rng = np.random.default_rng(0)
+    atoms = Atoms(
+        "Si8O8H4",
+        scaled_positions=rng.random((20, 3)),
+        cell=[[4.5, 0, 0], [1.0, 5.0, 0], [0, 0.5, 4.0]],
+        pbc=[True, True, False],
+    )
+
+    expected = _brute_force_close_pairs(atoms, tolerance)
+
+    assert expected
+    assert _close_pairs(workspace, atoms, tolerance) == expected